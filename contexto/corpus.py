@@ -0,0 +1,345 @@
+import numpy as np
+from limpieza import limpieza_basica
+from utils.tokenizacion import tokenizar
+
+
+class Vocabulario:
+    def __init__(self, terminos=None):
+        """
+        Constructor por defecto de la clase `Vocabulario`. Esta clase asigna \
+        a cada término (token) un identificador entero único, de forma que \
+        los textos puedan representarse como arreglos de enteros. Los \
+        identificadores se asignan en orden de aparición, empezando en `0`.
+
+        :param terminos: Lista de términos con los que se desea inicializar \
+            el vocabulario. Si `terminos = None`, el vocabulario empieza \
+            vacío. Valor por defecto `None`.
+        :type terminos: list, opcional
+        """
+        self.terminos = []
+        self.ids = {}
+        if terminos is not None:
+            self.codificar(terminos)
+
+    def __len__(self):
+        return len(self.terminos)
+
+    def __contains__(self, termino):
+        return termino in self.ids
+
+    def __getitem__(self, termino):
+        return self.ids[termino]
+
+    def codificar(self, tokens, agregar=True):
+        """
+        Convierte una lista de tokens en un arreglo con sus identificadores.
+
+        :param tokens: Lista de tokens que se desea codificar.
+        :type tokens: list
+        :param agregar: Si `agregar = True`, los tokens que no están en el \
+            vocabulario se agregan a este. Si `agregar = False`, a los tokens \
+            que no están en el vocabulario se les asigna el identificador \
+            `-1`. Valor por defecto `True`.
+        :type agregar: bool, opcional
+        :return: (numpy.ndarray) Arreglo de enteros de 32 bits con los \
+            identificadores de los tokens.
+        """
+        ids = self.ids
+        if not agregar:
+            codigos = [ids.get(t, -1) for t in tokens]
+            return np.array(codigos, dtype=np.int32)
+        n_terminos = len(self.terminos)
+        codigos = [ids.setdefault(t, len(ids)) for t in tokens]
+        # Los términos nuevos se agregan a la lista en el mismo orden en el
+        # que se les asignaron los identificadores
+        if len(ids) > n_terminos:
+            self.terminos.extend(
+                t for t in dict.fromkeys(tokens) if ids[t] >= n_terminos
+            )
+        return np.array(codigos, dtype=np.int32)
+
+    def decodificar(self, codigos):
+        """
+        Convierte un arreglo de identificadores en la lista de términos \
+        correspondiente.
+
+        :param codigos: Arreglo o lista de identificadores.
+        :type codigos: numpy.ndarray, list
+        :return: (list) Lista de términos.
+        """
+        terminos = self.terminos
+        return [terminos[i] for i in np.asarray(codigos).tolist()]
+
+
+class Corpus:
+    def __init__(
+        self, textos=None, tokenizador=None, limpiar=False, vocabulario=None
+    ):
+        """
+        Constructor por defecto de la clase `Corpus`. Esta clase guarda un \
+        conjunto de documentos tokenizados de forma compacta: todos los \
+        tokens se codifican con un `Vocabulario` y se almacenan en un solo \
+        arreglo de enteros de 32 bits, junto con las posiciones en las que \
+        empieza y termina cada documento. Esto reduce considerablemente el \
+        uso de memoria frente a las listas de strings, y permite que \
+        funciones como `frecuencia_ngramas`, `matriz_coocurrencias` y \
+        `graficar_dispersion` del módulo `exploracion` trabajen con \
+        operaciones sobre arreglos. Un mismo corpus puede reutilizarse en \
+        varios análisis sin volver a tokenizar los textos.
+
+        :param textos: Texto, lista de textos, o lista de documentos ya \
+            tokenizados (listas de tokens) que se desea agregar al corpus. \
+            Si `textos = None`, el corpus empieza vacío. Valor por \
+            defecto `None`.
+        :type textos: str, list, opcional
+        :param tokenizador: Objeto encargado de la tokenización de textos. \
+            Si el valor es `None`, se utilizará por defecto una instancia \
+            compartida de la clase `TokenizadorNLTK`. Valor por defecto \
+            `None`.
+        :type tokenizador: object, opcional
+        :param limpiar: Define si se desea hacer una limpieza básica \
+            (aplicando la función `limpieza_basica` del módulo \
+            `limpieza`) a los textos antes de tokenizarlos. Valor por \
+            defecto `False`.
+        :type limpiar: bool, opcional
+        :param vocabulario: Vocabulario con el que se codifican los tokens. \
+            Permite que varios corpus compartan los mismos identificadores. \
+            Si `vocabulario = None`, se crea un vocabulario nuevo. Valor por \
+            defecto `None`.
+        :type vocabulario: Vocabulario, opcional
+        """
+        self.vocabulario = (
+            Vocabulario() if vocabulario is None else vocabulario
+        )
+        self.tokenizador = tokenizador
+        self.limpiar = limpiar
+        self._ids = np.zeros(0, dtype=np.int32)
+        self._limites = np.zeros(1, dtype=np.int64)
+        # Documentos agregados que aún no se han unido a los arreglos
+        self._bloques = []
+        self._tamanos = []
+        if textos is not None:
+            self.agregar_documentos(textos)
+
+    def __len__(self):
+        return len(self._limites) - 1 + len(self._tamanos)
+
+    @property
+    def ids(self):
+        """
+        Arreglo de enteros de 32 bits con los identificadores de todos los \
+        tokens del corpus.
+        """
+        self._consolidar()
+        return self._ids
+
+    @property
+    def limites(self):
+        """
+        Arreglo con las posiciones (en `ids`) en las que empieza cada \
+        documento, más la posición final del corpus.
+        """
+        self._consolidar()
+        return self._limites
+
+    @property
+    def n_tokens(self):
+        return len(self.ids)
+
+    def _consolidar(self):
+        """
+        Une a los arreglos `ids` y `limites` los documentos agregados desde \
+        la última consulta. Así, agregar documentos uno por uno no copia \
+        todo el corpus en cada llamado.
+        """
+        if not self._bloques:
+            return
+        self._ids = np.concatenate([self._ids] + self._bloques)
+        self._limites = np.concatenate(
+            [
+                self._limites,
+                self._limites[-1] + np.cumsum(self._tamanos, dtype=np.int64),
+            ]
+        )
+        self._bloques = []
+        self._tamanos = []
+
+    def agregar_documentos(self, textos):
+        """
+        Tokeniza, codifica y agrega uno o varios documentos al corpus. Los \
+        documentos se pueden agregar uno por uno; los arreglos del corpus \
+        se actualizan la próxima vez que se consulten.
+
+        :param textos: Texto, lista de textos, o lista de documentos ya \
+            tokenizados (listas de tokens).
+        :type textos: str, list
+        """
+        if isinstance(textos, str):
+            textos = [textos]
+        for texto in textos:
+            if isinstance(texto, str):
+                if self.limpiar:
+                    texto = limpieza_basica(texto)
+                texto = tokenizar(texto, self.tokenizador)
+            codigos = self.vocabulario.codificar(texto)
+            self._bloques.append(codigos)
+            self._tamanos.append(len(codigos))
+
+    def documento(self, indice):
+        """
+        Devuelve los identificadores de los tokens de un documento, sin \
+        copiar los datos.
+
+        :param indice: Posición del documento dentro del corpus.
+        :type indice: int
+        :return: (numpy.ndarray) Arreglo de identificadores del documento.
+        """
+        return self.ids[self.limites[indice] : self.limites[indice + 1]]
+
+    def tokens(self, indice):
+        """
+        Devuelve los tokens de un documento.
+
+        :param indice: Posición del documento dentro del corpus.
+        :type indice: int
+        :return: (list) Lista de tokens del documento.
+        """
+        return self.vocabulario.decodificar(self.documento(indice))
+
+    def documento_por_token(self):
+        """
+        Devuelve, para cada token del corpus, la posición del documento al \
+        que pertenece.
+
+        :return: (numpy.ndarray) Arreglo con la posición del documento de \
+            cada token.
+        """
+        return np.repeat(np.arange(len(self)), np.diff(self.limites))
+
+    def frecuencias(self):
+        """
+        Cuenta el número de apariciones de cada término del vocabulario en \
+        el corpus.
+
+        :return: (numpy.ndarray) Arreglo con la frecuencia de cada término, \
+            en la posición de su identificador.
+        """
+        return np.bincount(self.ids, minlength=len(self.vocabulario))
+
+    def ngramas(self, n_grama=1):
+        """
+        Obtiene todos los n-gramas del corpus, sin incluir los que quedan \
+        repartidos entre dos documentos.
+
+        :param n_grama: Cantidad de elementos de cada n-grama. Valor por \
+            defecto `1`.
+        :type n_grama: int, opcional
+        :return: (numpy.ndarray) Arreglo de tamaño (n_ngramas, n_grama) con \
+            los identificadores de los términos de cada n-grama, en orden de \
+            aparición.
+        """
+        if n_grama == 1:
+            return self.ids[:, None]
+        if len(self.ids) < n_grama:
+            return np.zeros((0, n_grama), dtype=np.int32)
+        # Cada columna es el arreglo de identificadores desplazado una
+        # posición más que la anterior
+        ids = self.ids
+        n_ventanas = len(ids) - n_grama + 1
+        ventanas = np.stack(
+            [ids[i : n_ventanas + i] for i in range(n_grama)], axis=1
+        )
+        # Una ventana es válida si ningún documento empieza después de su
+        # primer elemento y hasta su último elemento
+        inicios = np.zeros(len(self.ids) + 1, dtype=np.int64)
+        np.add.at(inicios, self.limites[1:-1], 1)
+        inicios = np.cumsum(inicios)
+        fin = len(self.ids)
+        validas = inicios[n_grama - 1 : fin] == inicios[: len(ventanas)]
+        return ventanas[validas]
+
+    def contar_ngramas(self, n_grama=1, ordenar=True):
+        """
+        Cuenta las apariciones de cada n-grama del corpus.
+
+        :param n_grama: Cantidad de elementos de cada n-grama. Valor por \
+            defecto `1`.
+        :type n_grama: int, opcional
+        :param ordenar: Si `ordenar = True`, los n-gramas se ordenan de \
+            mayor a menor frecuencia y, en caso de empate, en orden de \
+            aparición. Si `ordenar = False`, se dejan en orden de \
+            aparición. Valor por defecto `True`.
+        :type ordenar: bool, opcional
+        :return: (tuple) Arreglo de tamaño (n_ngramas, n_grama) con los \
+            identificadores de los términos de cada n-grama distinto, y \
+            arreglo con sus frecuencias.
+        """
+        if n_grama == 1:
+            # Los identificadores se asignan en orden de aparición, por lo
+            # que un ordenamiento estable respeta ese orden en los empates
+            frec = self.frecuencias()
+            if ordenar:
+                orden = np.argsort(-frec, kind="stable")
+                orden = orden[frec[orden] > 0]
+            else:
+                orden = np.nonzero(frec)[0]
+            return orden[:, None].astype(np.int32), frec[orden]
+        ngramas = self.ngramas(n_grama)
+        n_vocab = max(len(self.vocabulario), 1)
+        if n_vocab ** n_grama < 2 ** 62:
+            # Cada n-grama se representa con un solo entero, lo que es
+            # mucho más rápido de ordenar que las filas de una matriz
+            llaves = np.zeros(len(ngramas), dtype=np.int64)
+            for i in range(n_grama):
+                llaves = llaves * n_vocab + ngramas[:, i]
+            _, primeros, frec = np.unique(
+                llaves, return_index=True, return_counts=True
+            )
+        else:
+            _, primeros, frec = np.unique(
+                ngramas, axis=0, return_index=True, return_counts=True
+            )
+        if ordenar:
+            orden = np.lexsort((primeros, -frec))
+        else:
+            orden = np.argsort(primeros)
+        return ngramas[primeros[orden]], frec[orden]
+
+    def frecuencia_ngramas(self, n_grama=1, n_max=None):
+        """
+        Genera un diccionario con los n-gramas del corpus y sus respectivas \
+        frecuencias de ocurrencia.
+
+        :param n_grama: Cantidad de elementos a tener en cuenta en la \
+            generación de n-gramas. Valor por defecto `1`.
+        :type n_grama: int, opcional
+        :param n_max: Cantidad máxima de n-gramas a generar. Si se define, \
+            se devuelven los `n_max` n-gramas más frecuentes, de mayor a \
+            menor frecuencia. Si `n_max = None`, se devuelven todos los \
+            n-gramas en orden de aparición. Valor por defecto `None`.
+        :type n_max: int, opcional
+        :return: (dict) Diccionario de n-gramas y sus frecuencias.
+        """
+        ngramas, frec = self.contar_ngramas(n_grama, n_max is not None)
+        if n_max is not None:
+            ngramas, frec = ngramas[:n_max], frec[:n_max]
+        terminos = self.vocabulario.terminos
+        return {
+            " ".join(terminos[i] for i in fila): f
+            for fila, f in zip(ngramas.tolist(), frec.tolist())
+        }
+
+
+def es_corpus(objeto):
+    """
+    Indica si un objeto es un corpus (de la clase `Corpus`). Se revisan sus \
+    atributos en lugar de su clase, para que funcione sin importar la ruta \
+    desde la que se importó el módulo.
+
+    :param objeto: Objeto que se desea revisar.
+    :return: (bool) `True` si el objeto es un corpus.
+    """
+    return all(
+        hasattr(objeto, atributo)
+        for atributo in ("vocabulario", "ids", "limites")
+    )
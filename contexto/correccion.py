@@ -2,7 +2,7 @@ import json
 from spellchecker import SpellChecker
 from limpieza import limpieza_basica
 from lenguajes import detectar_lenguaje, definir_lenguaje
-from utils.tokenizacion import TokenizadorNLTK
+from utils.tokenizacion import tokenizador_defecto
 
 # Definir clase para el corrector ortográfico ###
 
@@ -51,7 +51,7 @@ class Corrector:
         self.iniciar_corrector(diccionario)
         self.establecer_distancia(distancia)
         self.tokenizador = (
-            TokenizadorNLTK() if tokenizador is None else tokenizador
+            tokenizador_defecto() if tokenizador is None else tokenizador
         )
 
     def establecer_lenguaje(self, lenguaje):
@@ -1,4 +1,5 @@
 import cv2
+import os
 import matplotlib.pyplot as plt
 import matplotlib as mpl
 import matplotlib.colors as cl
@@ -7,10 +8,30 @@ from networkx.convert_matrix import from_pandas_adjacency
 import numpy as np
 import pandas as pd
 import warnings
-from collections import Counter, Iterable
+from scipy import sparse
+from collections import Counter
+from copy import copy
+from collections.abc import Iterable
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    ProcessPoolExecutor,
+    as_completed,
+    wait,
+)
+from functools import lru_cache, partial
+from itertools import islice
+from random import Random
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
 from wordcloud import WordCloud, ImageColorGenerator
+from corpus import Corpus, es_corpus
 from limpieza import limpieza_basica
-from utils.tokenizacion import tokenizar, TokenizadorNLTK
+from utils.conteo import ContadorAproximado
+from utils.tokenizacion import tokenizar
+
+# Número de tokens que se procesan a la vez al calcular la matriz de
+# coocurrencias por ventana
+TAM_BLOQUE_COOCURRENCIAS = 2 ** 22
 
 
 def obtener_ngramas(
@@ -55,13 +76,18 @@ def obtener_ngramas(
     return n_gramas
 
 
-def frecuencia_ngramas(texto, n_grama=1, n_max=None):
+def frecuencia_ngramas(
+    texto, n_grama=1, n_max=None, aproximado=False, capacidad=None
+):
     """
     Genera un diccionario con los n-gramas y sus respectivas frecuencias de \
     ocurrencia en el texto.
 
-    :param texto: Texto sobre el que se calculará la frecuencia de n-gramas.
-    :type texto: str
+    :param texto: Texto sobre el que se calculará la frecuencia de n-gramas. \
+        También puede ser un objeto de la clase `Corpus`, en cuyo caso la \
+        frecuencia se calcula con operaciones sobre arreglos y los n-gramas \
+        no se extienden entre dos documentos.
+    :type texto: str, Corpus
     :param n_grama: Cantidad de elementos a tener en cuenta en la generación \
         de n-gramas. Por ejemplo, si `n_grama = 1` se retornará frecuencia de \
         palabras, si `n_grama = 2` se retornará frecuencia de bigramas, si \
@@ -71,9 +97,30 @@ def frecuencia_ngramas(texto, n_grama=1, n_max=None):
     :param n_max: Cantidad máxima de n-gramas a generar. Valor por defecto \
         `None`.
     :type n_max: int, opcional
+    :param aproximado: Si `aproximado = True`, los n-gramas se cuentan con \
+        un contador de memoria acotada (clase `ContadorAproximado`), que \
+        guarda como máximo `capacidad` n-gramas distintos. Los conteos \
+        devueltos pueden superar a los reales como máximo en \
+        `total de n-gramas / capacidad`, y todo n-grama con más \
+        apariciones que ese valor queda incluido. No aplica si `texto` es \
+        un objeto de la clase `Corpus`. Valor por defecto `False`.
+    :type aproximado: bool, opcional
+    :param capacidad: Número máximo de n-gramas distintos que guarda el \
+        contador cuando `aproximado = True`. Si `capacidad = None`, se \
+        utiliza el mayor valor entre `10 * n_max` y `10000`. Valor por \
+        defecto `None`.
+    :type capacidad: int, opcional
     :return: (dict) diccionario de n-gramas más frecuentes.
     """
-    lista = obtener_ngramas(texto, n_grama)
+    if es_corpus(texto):
+        return texto.frecuencia_ngramas(n_grama, n_max)
+    lista = obtener_ngramas(texto, n_grama, devolver_lista=not aproximado)
+    if aproximado:
+        if capacidad is None:
+            capacidad = max(10 * (n_max or 0), 10000)
+        cont = ContadorAproximado(capacidad)
+        cont.actualizar(lista)
+        return dict(cont.most_common(n_max))
     cont = Counter(lista)
     if n_max is not None:
         dictu = dict(cont.most_common(n_max))
@@ -82,6 +129,394 @@ def frecuencia_ngramas(texto, n_grama=1, n_max=None):
     return dictu
 
 
+def _lotes(elementos, tam_lote):
+    """
+    Reparte los elementos de un iterable en listas de tamaño `tam_lote`, \
+    sin cargar todos los elementos en memoria.
+
+    :param elementos: Elementos que se desean repartir.
+    :type elementos: iterable
+    :param tam_lote: Número de elementos de cada lote.
+    :type tam_lote: int
+    :return: (generator) Generador de listas de elementos.
+    """
+    iterador = iter(elementos)
+    lote = list(islice(iterador, tam_lote))
+    while lote:
+        yield lote
+        lote = list(islice(iterador, tam_lote))
+
+
+def _contar_ngramas_lote(
+    documentos,
+    n_grama,
+    son_archivos,
+    limpiar,
+    tokenizador,
+    encoding,
+    min_frec=1,
+):
+    """
+    Cuenta los n-gramas de un lote de documentos. Los archivos se leen \
+    línea por línea, conservando las últimas palabras de cada línea para \
+    formar los n-gramas que quedan repartidos entre dos líneas. Los \
+    n-gramas que aparecen menos de `min_frec` veces en el lote se \
+    descartan.
+
+    :param documentos: Lista de textos o de rutas de archivos de texto.
+    :type documentos: list
+    :param n_grama: Cantidad de elementos de cada n-grama.
+    :type n_grama: int
+    :param son_archivos: Indica si los documentos son rutas de archivos.
+    :type son_archivos: bool
+    :param limpiar: Indica si se aplica la función `limpieza_basica`.
+    :type limpiar: bool
+    :param tokenizador: Objeto encargado de la tokenización de los textos.
+    :type tokenizador: object
+    :param encoding: Codificación de los archivos.
+    :type encoding: str
+    :param min_frec: Frecuencia mínima de los n-gramas que se conservan.
+    :type min_frec: int
+    :return: (collections.Counter) Conteo de los n-gramas del lote.
+    """
+    cuenta = Counter()
+
+    def contar(texto, anteriores):
+        if limpiar:
+            texto = limpieza_basica(texto)
+        tokens = anteriores + tokenizar(texto, tokenizador)
+        cuenta.update(
+            " ".join(n) for n in zip(*(tokens[i:] for i in range(n_grama)))
+        )
+        return tokens[len(tokens) - n_grama + 1 :] if n_grama > 1 else []
+
+    for documento in documentos:
+        if son_archivos:
+            anteriores = []
+            with open(documento, encoding=encoding) as fp:
+                for linea in fp:
+                    anteriores = contar(linea, anteriores)
+        else:
+            contar(documento, [])
+    if min_frec > 1:
+        cuenta = Counter({k: v for k, v in cuenta.items() if v >= min_frec})
+    return cuenta
+
+
+def _combinar_conteos(total, parcial, max_terminos, min_frec=1):
+    """
+    Suma un conteo parcial de n-gramas al conteo total. Si el conteo total \
+    supera `max_terminos` n-gramas distintos, primero se descartan los que \
+    tienen una frecuencia menor a `min_frec` y, si aún lo supera, se \
+    conservan solo los `max_terminos` más frecuentes.
+
+    :param total: Conteo total de n-gramas.
+    :type total: collections.Counter
+    :param parcial: Conteo parcial de n-gramas.
+    :type parcial: collections.Counter
+    :param max_terminos: Número máximo de n-gramas distintos que se \
+        conservan, o `None` para no aplicar límite.
+    :type max_terminos: int
+    :param min_frec: Frecuencia mínima de los n-gramas que se conservan \
+        cuando se supera `max_terminos`.
+    :type min_frec: int
+    :return: (collections.Counter) Conteo total actualizado.
+    """
+    total.update(parcial)
+    if max_terminos is not None and len(total) > max_terminos:
+        if min_frec > 1:
+            total = Counter(
+                {k: v for k, v in total.items() if v >= min_frec}
+            )
+        if len(total) > max_terminos:
+            total = Counter(dict(total.most_common(max_terminos)))
+    return total
+
+
+def contar_ngramas_corpus(
+    documentos,
+    n_grama=1,
+    n_procesos=1,
+    min_frec=1,
+    n_max=None,
+    max_terminos=None,
+    son_archivos=False,
+    limpiar=False,
+    tokenizador=None,
+    encoding="utf-8",
+    tam_lote=100,
+):
+    """
+    Cuenta los n-gramas de un conjunto grande de documentos o archivos. \
+    Los documentos se leen a medida que se necesitan y se reparten en \
+    lotes; cada lote se cuenta por separado (en paralelo, si \
+    `n_procesos > 1`) y los conteos parciales se suman a medida que están \
+    listos. Los n-gramas no se extienden entre dos documentos. El \
+    resultado puede usarse directamente en las funciones `nube_palabras` \
+    y `grafica_barchart_frecuencias`.
+
+    :param documentos: Textos de los documentos o, si \
+        `son_archivos = True`, rutas de archivos de texto plano. Puede ser \
+        un generador, para no cargar todos los documentos en memoria.
+    :type documentos: list, iterable
+    :param n_grama: Cantidad de elementos a tener en cuenta en la \
+        generación de n-gramas. Valor por defecto `1`.
+    :type n_grama: int, opcional
+    :param n_procesos: Número de procesos que se utilizan para contar los \
+        lotes. Si es `None`, se utiliza el número de núcleos del equipo. \
+        Valor por defecto `1`.
+    :type n_procesos: int, opcional
+    :param min_frec: Frecuencia mínima que debe tener un n-grama para ser \
+        incluido en el resultado. Si se define `max_terminos`, también se \
+        descartan de cada lote los n-gramas con una frecuencia menor y, \
+        cuando el conteo total supera `max_terminos`, los n-gramas del \
+        total que no la alcanzan. Valor por defecto `1`.
+    :type min_frec: int, opcional
+    :param n_max: Cantidad máxima de n-gramas que se devuelven (se eligen \
+        los más frecuentes). Si `n_max = None`, se devuelven todos. Valor \
+        por defecto `None`.
+    :type n_max: int, opcional
+    :param max_terminos: Número máximo de n-gramas distintos que se \
+        guardan en memoria mientras se suman los conteos. Cuando se supera, \
+        se descartan los que no alcanzan `min_frec` y, si es necesario, los \
+        menos frecuentes, por lo que la frecuencia de un n-grama descartado \
+        que vuelve a aparecer más adelante queda subestimada. Se recomienda \
+        que sea bastante mayor que `n_max`. Si `max_terminos = None`, el \
+        conteo es exacto, pero se guardan en memoria todos los n-gramas \
+        distintos del corpus; para corpus muy grandes se recomienda \
+        definir este parámetro. Valor por defecto `None`.
+    :type max_terminos: int, opcional
+    :param son_archivos: Indica si los elementos de `documentos` son \
+        rutas de archivos de texto plano. Los archivos se leen línea por \
+        línea. Valor por defecto `False`.
+    :type son_archivos: bool, opcional
+    :param limpiar: Define si se desea hacer una limpieza básica \
+        (aplicando la función `limpieza_basica` del módulo `limpieza`) a los \
+        textos antes de contar los n-gramas. Valor por defecto `False`.
+    :type limpiar: bool, opcional
+    :param tokenizador: Objeto encargado de la tokenización de textos. Si \
+        el valor es `None`, se utilizará por defecto una instancia de la \
+        clase `TokenizadorNLTK`. Para grandes volúmenes de texto se \
+        recomienda la clase `TokenizadorRapido`. Valor por defecto `None`.
+    :type tokenizador: object, opcional
+    :param encoding: Codificación de los archivos de texto. Valor por \
+        defecto `'utf-8'`.
+    :type encoding: str, opcional
+    :param tam_lote: Número de documentos de cada lote. Valor por defecto \
+        `100`.
+    :type tam_lote: int, opcional
+    :return: (dict) Diccionario de n-gramas y sus frecuencias, ordenado de \
+        mayor a menor frecuencia.
+    """
+    # Solo se poda durante la suma si se pide acotar la memoria; de lo
+    # contrario, el conteo es exacto
+    podar = min_frec if max_terminos is not None else 1
+    contar = partial(
+        _contar_ngramas_lote,
+        n_grama=n_grama,
+        son_archivos=son_archivos,
+        limpiar=limpiar,
+        tokenizador=tokenizador,
+        encoding=encoding,
+        min_frec=podar,
+    )
+    if n_procesos is None:
+        n_procesos = os.cpu_count()
+    total = Counter()
+    if n_procesos <= 1:
+        for lote in _lotes(documentos, tam_lote):
+            total = _combinar_conteos(
+                total, contar(lote), max_terminos, podar
+            )
+    else:
+        # Se limita el número de lotes pendientes, para que los documentos
+        # se lean a medida que los procesos quedan libres
+        with ProcessPoolExecutor(max_workers=n_procesos) as ejecutor:
+            pendientes = set()
+            for lote in _lotes(documentos, tam_lote):
+                if len(pendientes) >= 2 * n_procesos:
+                    listos, pendientes = wait(
+                        pendientes, return_when=FIRST_COMPLETED
+                    )
+                    for futuro in listos:
+                        total = _combinar_conteos(
+                            total, futuro.result(), max_terminos, podar
+                        )
+                pendientes.add(ejecutor.submit(contar, lote))
+            for futuro in as_completed(pendientes):
+                total = _combinar_conteos(
+                    total, futuro.result(), max_terminos, podar
+                )
+    return {
+        ngrama: frec
+        for ngrama, frec in total.most_common(n_max)
+        if frec >= min_frec
+    }
+
+
+def _frecuencias_grafica(texto, n_grama, n_terminos, aproximado=False):
+    """
+    Obtiene las frecuencias de los términos que se incluyen en una gráfica.
+
+    :param texto: Texto, objeto de la clase `Corpus` o diccionario de \
+        términos y frecuencias (por ejemplo, el resultado de la función \
+        `contar_ngramas_corpus`).
+    :type texto: str, Corpus, dict
+    :param n_grama: Cantidad de elementos de cada n-grama. No se utiliza \
+        si `texto` es un diccionario.
+    :type n_grama: int
+    :param n_terminos: Cantidad de términos más frecuentes que se incluyen.
+    :type n_terminos: int
+    :param aproximado: Indica si los n-gramas se cuentan de forma \
+        aproximada, con memoria acotada.
+    :type aproximado: bool
+    :return: (dict) Diccionario de los términos más frecuentes.
+    """
+    if isinstance(texto, dict):
+        return dict(Counter(texto).most_common(n_terminos))
+    return frecuencia_ngramas(
+        texto, n_grama, n_terminos, aproximado=aproximado
+    )
+
+
+@lru_cache(maxsize=1)
+def _mascara_circular():
+    """
+    Crea la máscara circular que se usa por defecto para ordenar las nubes \
+    de palabras. La máscara se crea una sola vez y no se puede modificar.
+
+    :return: (numpy.ndarray) Máscara de 600 x 600 pixeles, con valor `0` \
+        dentro del círculo y `255` por fuera.
+    """
+    x, y = np.ogrid[:600, :600]
+    mascara = (x - 300) ** 2 + (y - 300) ** 2 > 260 ** 2
+    mascara = 255 * mascara.astype(int)
+    mascara.setflags(write=False)
+    return mascara
+
+
+def _procesar_forma(forma):
+    """
+    Prepara la máscara que define la forma de una nube de palabras.
+
+    :param forma: Arreglo de Numpy o ubicación de archivo de imagen que \
+        contenga la forma de la nube. Si `forma = None`, se usa una \
+        máscara circular.
+    :type forma: numpy.array, str
+    :return: (tuple) Máscara de la nube y generador de colores de la \
+        imagen (`None` si la imagen no es a color).
+    """
+    # Por defecto se crea una máscara circular para ordenar la nube
+    if forma is None:
+        return _mascara_circular(), None
+    # Si se pasó la ubicación de una imagen, se carga
+    if isinstance(forma, str):
+        forma = cv2.imread(forma)
+    # Si se pasó una imagen a color, se conservan sus colores y se
+    # convierte a escala de grises
+    colores_nube = None
+    if len(forma.shape) == 3:
+        colores_nube = ImageColorGenerator(forma)
+        forma = cv2.cvtColor(forma, cv2.COLOR_BGR2GRAY)
+    # Se aplica un umbral para eliminar ruido y marcas de agua de
+    # la máscara
+    forma = cv2.threshold(
+        forma, 0, 255, cv2.THRESH_BINARY | cv2.THRESH_OTSU
+    )[1]
+    # Si la mayoría de la imagen está en negro, se invierte la
+    # imagen máscara
+    if np.mean(forma) < 100:
+        forma = 255 - forma
+    # Operación de "closing" para rellenar huecos en la imagen máscara
+    kernel = np.ones((5, 5), np.uint8)
+    forma = 255 - cv2.morphologyEx(255 - forma, cv2.MORPH_CLOSE, kernel)
+    return forma, colores_nube
+
+
+class PlantillaNube:
+    def __init__(
+        self,
+        forma=None,
+        color_fondo="white",
+        color_contorno="blue",
+        grosor_contorno=0,
+        hor=0.6,
+        colores_forma=False,
+        semilla=1234,
+    ):
+        """
+        Constructor por defecto de la clase `PlantillaNube`. Esta clase \
+        guarda la configuración de una nube de palabras (la máscara de la \
+        forma ya procesada, el generador de colores y el objeto \
+        `WordCloud`), para generar muchas nubes con la misma forma sin \
+        repetir ese trabajo en cada una. Se puede pasar a las funciones \
+        `nube_palabras` y `par_nubes` por medio del parámetro `plantilla`. \
+        Una misma plantilla no debe usarse desde varios hilos a la vez.
+
+        :param forma: Arreglo de Numpy o ubicación de archivo de imagen \
+            que contenga la forma que se le desea dar a la nube de \
+            palabras. Si `forma = None`, se ordenarán los términos de la \
+            nube en forma de círculo. Valor por defecto `None`.
+        :type forma: numpy.array, str, opcional
+        :param color_fondo: Color de fondo de la nube de palabras. Valor \
+            por defecto `"white"`.
+        :type color_fondo: str, tuple, opcional
+        :param color_contorno: Color del contorno de la forma de la nube \
+            de palabras. Valor por defecto `"blue"`.
+        :type color_contorno: str, tuple, opcional
+        :param grosor_contorno: Grosor del contorno de la forma de la nube \
+            de palabras. Si `grosor_contorno = 0`, no se graficará el \
+            contorno. Valor por defecto `0`.
+        :type grosor_contorno: int, opcional
+        :param hor: Valor entre `0` y `1`. Proporción de los términos que \
+            se mostrarán de manera horizontal en la nube. Valor por \
+            defecto `0.6`.
+        :type hor: float, opcional
+        :param colores_forma: Indica si se quieren utilizar en la nube de \
+            palabras los colores extraídos de la imagen utilizada para \
+            definir la forma de la nube. Valor por defecto `False`.
+        :type colores_forma: bool, opcional
+        :param semilla: Estado inicial del generador aleatorio. Todas las \
+            nubes generadas con la plantilla parten de esta semilla, por \
+            lo que los mismos términos producen la misma nube. Valor por \
+            defecto `1234`.
+        :type semilla: int, opcional
+        """
+        self.forma, self.colores_nube = _procesar_forma(forma)
+        self.colores_forma = colores_forma
+        self.semilla = semilla
+        self.nube = WordCloud(
+            background_color=color_fondo,
+            contour_color=color_contorno,
+            prefer_horizontal=hor,
+            mask=self.forma,
+            random_state=semilla,
+            contour_width=grosor_contorno,
+        )
+
+    def generar(self, frecuencias):
+        """
+        Genera una nube de palabras con la configuración de la plantilla.
+
+        :param frecuencias: Diccionario de términos y sus frecuencias.
+        :type frecuencias: dict
+        :return: (WordCloud) Objeto tipo `WordCloud` con la nube generada. \
+            Es independiente de la plantilla, por lo que no cambia al \
+            generar nuevas nubes.
+        """
+        # Se reinicia el generador aleatorio para que la nube no dependa
+        # de las nubes generadas antes con la plantilla
+        self.nube.random_state = Random(self.semilla)
+        nube = self.nube.generate_from_frequencies(frecuencias)
+        # Si se eligió mantener los colores de la imagen de forma, se
+        # cambian los colores a la nube
+        if self.colores_forma and self.colores_nube is not None:
+            nube = nube.recolor(color_func=self.colores_nube)
+        # Copia superficial: la plantilla reemplaza (no modifica) la
+        # distribución de términos en cada nube nueva
+        return copy(nube)
+
+
 def nube_palabras(
     texto,
     n_grama=1,
@@ -99,13 +534,17 @@ def nube_palabras(
     semilla=1234,
     devolver_nube=False,
     mask=None,
+    aproximado=False,
+    plantilla=None,
 ):
     """
     Permite graficar o exportar una nube de palabras (o n-gramas) a partir de \
     un texto de entrada.
 
-    :param texto: Texto de entrada que se desea analizar.
-    :type texto: str
+    :param texto: Texto de entrada que se desea analizar, objeto de la \
+        clase `Corpus`, o diccionario de términos y frecuencias (por \
+        ejemplo, el resultado de la función `contar_ngramas_corpus`).
+    :type texto: str, Corpus, dict
     :param n: Cantidad de elementos a tener en cuenta en la generación \
         de n-gramas. Por ejemplo, si `n = 1` se retornarán palabras, \
         si `n = 2` se retornarán bigramas, si `n = 3` se retornarán \
@@ -166,6 +605,17 @@ def nube_palabras(
     :param devolver_nube: Indica si se desea obtener la nube de palabras como \
         un objeto tipo `WordCloud`. Valor por defecto `False`.
     :type devolver_nube: bool, opcional
+    :param aproximado: Si `aproximado = True`, los n-gramas se cuentan de \
+        forma aproximada y con memoria acotada. Ver la función \
+        `frecuencia_ngramas`. Valor por defecto `False`.
+    :type aproximado: bool, opcional
+    :param plantilla: Plantilla con la forma, los colores y la \
+        configuración de la nube, que se reutiliza para no procesar de \
+        nuevo la forma en cada llamado. Si se define, se ignoran los \
+        parámetros `hor`, `forma`, `color_fondo`, `color_contorno`, \
+        `grosor_contorno`, `colores_forma` y `semilla`. Valor por defecto \
+        `None`.
+    :type plantilla: PlantillaNube, opcional
     :return: (WordCloud) objeto  de tipo `WordCloud`, solo si \
         `devolver_nube = True`.
     """
@@ -179,49 +629,20 @@ def nube_palabras(
         )
         warnings.warn(msj, DeprecationWarning, stacklevel=2)
         forma = mask
-    # Por defecto se crea una máscara circular para ordenar la nube
-    if forma is None:
-        x, y = np.ogrid[:600, :600]
-        forma = (x - 300) ** 2 + (y - 300) ** 2 > 260 ** 2
-        forma = 255 * forma.astype(int)
-    else:
-        # Si se pasó la ubicación de una imagen, se carga
-        if isinstance(forma, str):
-            forma = cv2.imread(forma)
-        # Si se pasó una imagen a color, se conservan sus colores y se
-        # convierte a escala de grises
-        colores_nube = None
-        if len(forma.shape) == 3:
-            colores_nube = ImageColorGenerator(forma)
-            forma = cv2.cvtColor(forma, cv2.COLOR_BGR2GRAY)
-        # Se aplica un umbral para eliminar ruido y marcas de agua de
-        # la máscara
-        forma = cv2.threshold(
-            forma, 0, 255, cv2.THRESH_BINARY | cv2.THRESH_OTSU
-        )[1]
-        # Si la mayoría de la imagen está en negro, se invierte la
-        # imagen máscara
-        if np.mean(forma) < 100:
-            forma = 255 - forma
-        # Operación de "closing" para rellenar huecos en la imagen máscara
-        kernel = np.ones((5, 5), np.uint8)
-        forma = 255 - cv2.morphologyEx(255 - forma, cv2.MORPH_CLOSE, kernel)
+    if plantilla is None:
+        plantilla = PlantillaNube(
+            forma,
+            color_fondo,
+            color_contorno,
+            grosor_contorno,
+            hor,
+            colores_forma,
+            semilla,
+        )
     # Obtener diccionario de 'n_terminos' más frecuentes con sus frecuencias
-    dictu = frecuencia_ngramas(texto, n_grama, n_terminos)
+    dictu = _frecuencias_grafica(texto, n_grama, n_terminos, aproximado)
     # Crear la nube de palabras
-    nube = WordCloud(
-        background_color=color_fondo,
-        contour_color=color_contorno,
-        prefer_horizontal=hor,
-        mask=forma,
-        random_state=semilla,
-        contour_width=grosor_contorno,
-    )
-    figura = nube.generate_from_frequencies(dictu)
-    # Si se eligió mantener los colores de la imagen de forma, se cambian
-    # los colores a la nube
-    if colores_forma and colores_nube is not None:
-        nube = nube.recolor(color_func=colores_nube)
+    figura = plantilla.generar(dictu)
     # Devolver el objeto de la nube, para graficarlo de otra manera
     if devolver_nube:
         return figura
@@ -230,6 +651,26 @@ def nube_palabras(
         grafica_nube(figura, dim_figura, titulo, ubicacion_archivo, graficar)
 
 
+def _dibujar_nube(fig, nube, titulo):
+    """
+    Dibuja una nube de palabras en una figura de `Matplotlib`.
+
+    :param fig: Figura sobre la que se dibuja la nube.
+    :type fig: matplotlib.figure.Figure
+    :param nube: Objeto tipo `WordCloud` correspondiente a la nube \
+        de palabras.
+    :type nube: WordCloud
+    :param titulo: Título de la nube de palabras. Si `titulo = ""`, la \
+        nube no lleva título.
+    :type titulo: str
+    """
+    ax = fig.add_subplot()
+    ax.imshow(nube, interpolation="bilinear")
+    if titulo != "":
+        ax.set_title(titulo)
+    ax.axis("off")
+
+
 def grafica_nube(
     nube,
     dim_figura=(10, 10),
@@ -260,10 +701,7 @@ def grafica_nube(
     """
 
     fig = plt.figure(figsize=dim_figura)
-    plt.imshow(nube, interpolation="bilinear")
-    if titulo != "":
-        plt.title(titulo)
-    plt.axis("off")
+    _dibujar_nube(fig, nube, titulo)
     if graficar:
         plt.show()
     if ubicacion_archivo is not None:
@@ -272,6 +710,49 @@ def grafica_nube(
     plt.close()
 
 
+def _dibujar_par_nubes(fig, texto, n1, n2, aproximado, plantilla=None):
+    """
+    Genera un par de nubes de palabras a partir de un texto y las dibuja, \
+    una junto a otra, en una figura de `Matplotlib`. Ver la función \
+    `par_nubes`.
+
+    :param fig: Figura sobre la que se dibujan las nubes.
+    :type fig: matplotlib.figure.Figure
+    """
+    # Obtener nubes de palabras
+    nube_1 = nube_palabras(
+        texto,
+        n_grama=n1,
+        hor=0.8,
+        devolver_nube=True,
+        aproximado=aproximado,
+        plantilla=plantilla,
+    )
+    nube_2 = nube_palabras(
+        texto,
+        n_grama=n2,
+        hor=1,
+        devolver_nube=True,
+        aproximado=aproximado,
+        plantilla=plantilla,
+    )
+    ax1, ax2 = fig.subplots(
+        nrows=1, ncols=2, gridspec_kw={"hspace": 0, "wspace": 0}
+    )
+
+    ax1.imshow(nube_1, interpolation="bilinear")
+    tit = "términos" if n1 == 1 else f"n_gramas ({n1})"
+    ax1.set_title(f"Nube de palabras: {tit}", size=18)
+
+    ax2.imshow(nube_2, interpolation="bilinear")
+    tit = "términos" if n2 == 1 else f"n_gramas ({n2})"
+    ax2.set_title(f"Nube de palabras: {tit}", size=18)
+
+    fig.suptitle("Términos más frecuentes", size=28, y=0.99)
+    for ax in fig.get_axes():
+        ax.set(xticks=[], yticks=[])
+
+
 def par_nubes(
     texto,
     n1=1,
@@ -280,13 +761,16 @@ def par_nubes(
     ubicacion_archivo=None,
     graficar=True,
     devolver_grafica=False,
+    aproximado=False,
+    plantilla=None,
 ):
     """
     Permite graficar o exportar un par de nubes de palabras (una junto a \
     otra) a partir de un texto.
 
-    :param texto: Corresponde al texto que se desea analizar.
-    :type texto: str
+    :param texto: Corresponde al texto que se desea analizar, u objeto de \
+        la clase `Corpus`.
+    :type texto: str, Corpus
     :param n1: Cantidad de elementos a tener en cuenta en la generación de \
         n-gramas de la nube de palabras izquierda. Valor por defecto `1`.
     :type n1: int, opcional
@@ -308,32 +792,23 @@ def par_nubes(
         par de nubes de palabras como un objeto de `Matplotlib`. Valor \
         por defecto `False`.
     :type devolver_grafica: bool, opcional
+    :param aproximado: Si `aproximado = True`, los n-gramas se cuentan de \
+        forma aproximada y con memoria acotada. Ver la función \
+        `frecuencia_ngramas`. Valor por defecto `False`.
+    :type aproximado: bool, opcional
+    :param plantilla: Plantilla con la que se generan las dos nubes de \
+        palabras. Ver la clase `PlantillaNube`. Si `plantilla = None`, se \
+        usa la forma circular por defecto, con una proporción de términos \
+        horizontales de `0.8` en la nube izquierda y de `1` en la derecha. \
+        Valor por defecto `None`.
+    :type plantilla: PlantillaNube, opcional
     :return: (objeto Figure de Matplotlib) Figura con el par de nubes de \
         palabras, solo si `devolver_grafica = True`.
     """
 
-    # Obtener nubes de palabras
-    nube_1 = nube_palabras(texto, n_grama=n1, hor=0.8, devolver_nube=True)
-    nube_2 = nube_palabras(texto, n_grama=n2, hor=1, devolver_nube=True)
-
     # Graficar nubes y mostrarlas
-    fig, (ax1, ax2) = plt.subplots(
-        nrows=1,
-        ncols=2,
-        figsize=dim_figura,
-        gridspec_kw={"hspace": 0, "wspace": 0},
-    )
-
-    ax1.imshow(nube_1, interpolation="bilinear")
-    tit = "términos" if n1 == 1 else f"n_gramas ({n1})"
-    ax1.set_title(f"Nube de palabras: {tit}", size=18)
-
-    ax2.imshow(nube_2, interpolation="bilinear")
-    tit = "términos" if n2 == 1 else f"n_gramas ({n2})"
-    ax2.set_title(f"Nube de palabras: {tit}", size=18)
-
-    fig.suptitle("Términos más frecuentes", size=28, y=0.99)
-    plt.setp(plt.gcf().get_axes(), xticks=[], yticks=[])
+    fig = plt.figure(figsize=dim_figura)
+    _dibujar_par_nubes(fig, texto, n1, n2, aproximado, plantilla)
     if graficar:
         plt.show()
     if ubicacion_archivo is not None:
@@ -353,19 +828,24 @@ def matriz_coocurrencias(
     tri_sup=True,
     limpiar=False,
     tokenizador=None,
+    dispersa=False,
 ):
     """
     Calcula la matriz de coocurrencias de un texto.
 
     :param texto: Corresponde al texto (o lista de textos/documentos) que \
-        se desea analizar.
-    :type texto: str, list
+        se desea analizar. También puede ser un objeto de la clase \
+        `Corpus`, en cuyo caso no se vuelve a tokenizar el texto y los \
+        parámetros `limpiar` y `tokenizador` no se utilizan.
+    :type texto: str, list, Corpus
     :param min_frec: Frecuencia mínima de aparición de palabras, si la \
         frecuencia de una palabra es menor a `min_frec`, será excluida de la \
         matriz. Valor por defecto `1`.
     :type min_frec: int, opcional
     :param max_num: Número máximo de palabras que se incluyen en la matriz \
-        (se eligen las más frecuentes). Valor por defecto `200`.
+        (se eligen las más frecuentes). Si `max_num = None`, se incluyen \
+        todas las palabras. Para valores grandes (miles de palabras) se \
+        recomienda utilizar `dispersa = True`. Valor por defecto `200`.
     :type max_num: int, opcional
     :param modo: Corresponde al modo de análisis, con `'documento'` se \
         calcula la coocurrencia de términos sin importar la distancia entre \
@@ -391,65 +871,144 @@ def matriz_coocurrencias(
         de textos. Si el valor es 'None', se utilizará por defecto una \
         instancia de la clase *TokenizadorNLTK*. Valor por defecto `None`.
     :type tokenizador: Tokenizador, opcional
+    :param dispersa: Si `dispersa = True`, la matriz se devuelve como un \
+        `DataFrame` de pandas con columnas dispersas de enteros \
+        (`SparseDtype`), que solo guarda los valores distintos de cero. Se \
+        puede obtener la matriz de `scipy` correspondiente con el método \
+        `sparse.to_coo()` del `DataFrame`. Valor por defecto `False`.
+    :type dispersa: bool, opcional
     :return: (pandas.DataFrame) Matriz de coocurrencias de los textos de \
-        entrada.
+        entrada, con las filas y columnas ordenadas alfabéticamente.
     """
-    # Generar un solo texto con todos los documentos
-    if isinstance(texto, Iterable) and not isinstance(texto, str):
-        texto_entero = " ".join([str(i) for i in texto])
-    else:
-        texto_entero = str(texto)
-        texto = [texto_entero]  # Convertir variable "texto" en un iterable
-
-    if limpiar:
-        texto = [limpieza_basica(t) for t in texto]
-        texto_entero = " ".join([texto])
-    # Se inicializa un solo tokenizador, para ahorrar un poco de tiempo
-    tok = TokenizadorNLTK() if tokenizador is None else tokenizador
-    # Generar lista de palabras en todos los textos juntos
-    palabras = tokenizar(texto_entero, tok)
+    # Los textos se tokenizan una sola vez y se codifican como un corpus
+    if not es_corpus(texto):
+        if isinstance(texto, Iterable) and not isinstance(texto, str):
+            texto = [str(i) for i in texto]
+        else:
+            texto = [str(texto)]
+        texto = Corpus(texto, tokenizador=tokenizador, limpiar=limpiar)
     # Dejar solo las palabras con mayor frecuencia y/o que cumplan una
-    # frecuencia mínima
-    cuenta = dict(Counter(palabras).most_common(max_num))
-    cuenta_filt = {k: v for k, v in cuenta.items() if v >= min_frec}
-    nombres = list(set(cuenta_filt.keys()))
-    # Inicializar en ceros la matriz de coocurrencias
-    mat_oc = pd.DataFrame(
-        np.zeros([len(nombres), len(nombres)]), columns=nombres, index=nombres
-    )
+    # frecuencia mínima. Como los identificadores del vocabulario se
+    # asignan en orden de aparición, los empates se resuelven igual que
+    # con un Counter
+    frec = texto.frecuencias()
+    seleccion = np.argsort(-frec, kind="stable")[:max_num]
+    seleccion = seleccion[frec[seleccion] >= max(min_frec, 1)]
+    # Ordenar los términos alfabéticamente
+    nombres = texto.vocabulario.decodificar(seleccion)
+    orden = sorted(range(len(nombres)), key=nombres.__getitem__)
+    seleccion = seleccion[orden]
+    nombres = [nombres[i] for i in orden]
     if modo == "ventana":
-        for t in texto:
-            palabras_t = tokenizar(t, tok)
-            # Ciclo a través de las palabras para obtener las coocurrencias:
-            for i, p1 in enumerate(palabras_t):
-                inicio = max(0, i - ventana)
-                fin = min(len(palabras), i + ventana + 1)
-                for j, p2 in enumerate(palabras_t[inicio:fin]):
-                    if (p2 in nombres) and (p1 in nombres):
-                        if p1 != p2:
-                            mat_oc[p2][p1] += 1
-                        else:
-                            if (inicio + j) != i:
-                                mat_oc[p2][p1] += 1
+        mat_oc = _coocurrencias_ventana(texto, seleccion, ventana)
     elif modo == "documento":
-        for t in texto:
-            cuenta_t = dict(Counter(tokenizar(t, tok)))
-            for p1 in nombres:
-                for p2 in nombres:
-                    if p1 != p2:
-                        if p1 in cuenta_t and p2 in cuenta_t:
-                            mat_oc[p2][p1] += cuenta_t[p1] * cuenta_t[p2]
-                    else:
-                        if p1 in cuenta_t:
-                            mat_oc[p2][p1] += cuenta_t[p1]
-
-    # Ordenar filas y columnas alfabeticamente
-    mat_oc.sort_index(inplace=True)
-    mat_oc = mat_oc.reindex(sorted(mat_oc.columns), axis=1)
+        mat_oc = _coocurrencias_documento(texto, seleccion)
+    else:
+        print("Modo no válido. Debe ser 'documento' o 'ventana'.")
+        return None
     if tri_sup:
-        mat_oc = diag_superior(mat_oc)
+        mat_oc = sparse.triu(mat_oc)
+    if dispersa:
+        return pd.DataFrame.sparse.from_spmatrix(
+            mat_oc.tocsc(), index=nombres, columns=nombres
+        )
+    return pd.DataFrame(
+        mat_oc.toarray().astype(float), index=nombres, columns=nombres
+    )
+
+
+def _tokens_seleccionados(corpus, seleccion):
+    """
+    Encuentra los tokens de un corpus que corresponden a los términos \
+    seleccionados para la matriz de coocurrencias.
+
+    :param corpus: Corpus que se desea analizar.
+    :type corpus: Corpus
+    :param seleccion: Identificadores de los términos seleccionados, en el \
+        orden de las filas y columnas de la matriz.
+    :type seleccion: numpy.ndarray
+    :return: (tuple) Posición de cada token seleccionado en el corpus, \
+        fila de la matriz que le corresponde y documento al que pertenece.
+    """
+    fila_termino = np.full(len(corpus.vocabulario), -1, dtype=np.int64)
+    fila_termino[seleccion] = np.arange(len(seleccion))
+    filas = fila_termino[corpus.ids]
+    posiciones = np.nonzero(filas >= 0)[0]
+    documentos = np.searchsorted(corpus.limites, posiciones, side="right") - 1
+    return posiciones, filas[posiciones], documentos
+
+
+def _coocurrencias_documento(corpus, seleccion):
+    """
+    Calcula la matriz de coocurrencias por documento como el producto \
+    XᵀX, donde X es la matriz dispersa de documentos y términos con el \
+    número de apariciones de cada término. La diagonal corresponde al \
+    número total de apariciones de cada término.
 
-    return mat_oc
+    :param corpus: Corpus que se desea analizar.
+    :type corpus: Corpus
+    :param seleccion: Identificadores de los términos de la matriz.
+    :type seleccion: numpy.ndarray
+    :return: (scipy.sparse.csr_matrix) Matriz de coocurrencias.
+    """
+    k = len(seleccion)
+    _, filas, documentos = _tokens_seleccionados(corpus, seleccion)
+    # Al convertir a CSR se suman las apariciones repetidas
+    doc_term = sparse.csr_matrix(
+        (np.ones(len(filas), dtype=np.int64), (documentos, filas)),
+        shape=(len(corpus), k),
+    )
+    mat_oc = (doc_term.T @ doc_term).tocsr()
+    total = np.asarray(doc_term.sum(axis=0)).ravel()
+    diagonal = sparse.diags(total - mat_oc.diagonal(), dtype=np.int64)
+    return (mat_oc + diagonal).tocsr()
+
+
+def _coocurrencias_ventana(corpus, seleccion, ventana):
+    """
+    Calcula la matriz de coocurrencias por ventana. Se cuentan las parejas \
+    de tokens seleccionados que están a una distancia de máximo `ventana` \
+    palabras dentro de un mismo documento, en ambos sentidos. Las parejas \
+    se acumulan por bloques, para limitar el uso de memoria en corpus \
+    grandes.
+
+    :param corpus: Corpus que se desea analizar.
+    :type corpus: Corpus
+    :param seleccion: Identificadores de los términos de la matriz.
+    :type seleccion: numpy.ndarray
+    :param ventana: Tamaño de la ventana.
+    :type ventana: int
+    :return: (scipy.sparse.csr_matrix) Matriz de coocurrencias.
+    """
+    k = len(seleccion)
+    posiciones, filas, documentos = _tokens_seleccionados(corpus, seleccion)
+    n = len(filas)
+    mat_oc = sparse.csr_matrix((k, k), dtype=np.int64)
+    for inicio in range(0, n, TAM_BLOQUE_COOCURRENCIAS):
+        fin = min(inicio + TAM_BLOQUE_COOCURRENCIAS, n)
+        filas_bloque, columnas_bloque = [], []
+        # Como solo se guardan los tokens seleccionados, el token que está
+        # "salto" lugares más adelante puede estar a una distancia mayor en
+        # el texto original, por lo que se revisa la distancia real
+        for salto in range(1, ventana + 1):
+            a = slice(inicio, min(fin, n - salto))
+            b = slice(a.start + salto, a.stop + salto)
+            validos = (posiciones[b] - posiciones[a] <= ventana) & (
+                documentos[b] == documentos[a]
+            )
+            filas_bloque.append(filas[a][validos])
+            columnas_bloque.append(filas[b][validos])
+        filas_bloque = np.concatenate(filas_bloque)
+        columnas_bloque = np.concatenate(columnas_bloque)
+        mat_oc = mat_oc + sparse.csr_matrix(
+            (
+                np.ones(len(filas_bloque), dtype=np.int64),
+                (filas_bloque, columnas_bloque),
+            ),
+            shape=(k, k),
+        )
+    # Cada pareja se cuenta en ambos sentidos
+    return (mat_oc + mat_oc.T).tocsr()
 
 
 def diag_superior(df):
@@ -486,7 +1045,8 @@ def graficar_coocurrencias(
     """
     Grafica una matriz de coocurrencia como un grafo no dirigido de términos.
 
-    :param mat: Matriz de coocurrencia de términos
+    :param mat: Matriz de coocurrencia de términos. Puede ser densa o \
+        dispersa (obtenida con `matriz_coocurrencias(..., dispersa=True)`).
     :type mat: pandas.DataFrame
     :param dim_figura: Corresponden al ancho y alto de la figura en pulgadas. \
         Valor por defecto `(10, 6)`.
@@ -579,6 +1139,42 @@ def graficar_coocurrencias(
     return ax
 
 
+def _dibujar_barchart(fig, dict_datos, titulo, ascendente):
+    """
+    Dibuja un gráfico de barras horizontales de frecuencias de términos \
+    en una figura de `Matplotlib`.
+
+    :param fig: Figura sobre la que se dibuja el gráfico.
+    :type fig: matplotlib.figure.Figure
+    :param dict_datos: Diccionario de términos y sus frecuencias.
+    :type dict_datos: dict
+    :param titulo: Título del gráfico. Si `titulo = ""`, el gráfico no \
+        lleva título.
+    :type titulo: str
+    :param ascendente: Determina si las barras de términos se muestran de \
+        menos (abajo) a más (arriba) frecuentes en la gráfica.
+    :type ascendente: bool
+    """
+    # Ordenar datos en un dataframe
+    df = pd.DataFrame.from_dict(dict_datos, orient="index")
+    df = df.reset_index()
+    df.columns = ["n_grama", "frecuencia"]
+    df = df.sort_values(by="frecuencia", ascending=ascendente)
+    ax = fig.subplots()
+    y_pos = np.arange(len(df["frecuencia"]))
+    ax.barh(y_pos, df["frecuencia"], align="center")
+    ax.set_yticks(y_pos)
+    ax.set_yticklabels(df["n_grama"])
+    if titulo != "":
+        ax.set_title(titulo)
+    ax.set_xlabel("Frecuencia")
+    ax.set_ylabel("Término")
+    fig.tight_layout()
+    #
+    for i, v in enumerate(df["frecuencia"]):
+        ax.text(v, i, v, fontsize=10, verticalalignment="center")
+
+
 def grafica_barchart_frecuencias(
     texto,
     n_grama=1,
@@ -589,13 +1185,16 @@ def grafica_barchart_frecuencias(
     graficar=True,
     n_terminos=15,
     devolver_grafica=False,
+    aproximado=False,
 ):
     """
     Permite graficar o exportar un gráfico de barras horizontales de la \
     frecuencia de palabras o n-gramas a partir de un texto.
 
-    :param texto: Corresponde al texto que se desea analizar.
-    :type texto: str
+    :param texto: Corresponde al texto que se desea analizar, objeto de la \
+        clase `Corpus`, o diccionario de términos y frecuencias (por \
+        ejemplo, el resultado de la función `contar_ngramas_corpus`).
+    :type texto: str, Corpus, dict
     :param n_grama: Cantidad de elementos a tener en cuenta en la generación \
         de n-gramas. Valor por defecto `1`.
     :type n_grama: int, opcional
@@ -624,33 +1223,23 @@ def grafica_barchart_frecuencias(
         barras como un objeto de `Matplotlib`. \
         Valor por defecto `False`.
     :type devolver_grafica: bool, opcional
+    :param aproximado: Si `aproximado = True`, los n-gramas se cuentan de \
+        forma aproximada y con memoria acotada. Ver la función \
+        `frecuencia_ngramas`. Valor por defecto `False`.
+    :type aproximado: bool, opcional
     :return: (Matplotlib.Figure) Figura con el gráfico de barras, \
         solo si `devolver_grafica = True`.
     """
-    dict_datos = frecuencia_ngramas(texto, n_grama, n_terminos)
-    # Ordenar datos en un dataframe
-    df = pd.DataFrame.from_dict(dict_datos, orient="index")
-    df = df.reset_index()
-    df.columns = ["n_grama", "frecuencia"]
-    df = df.sort_values(by="frecuencia", ascending=ascendente)
+    dict_datos = _frecuencias_grafica(
+        texto, n_grama, n_terminos, aproximado
+    )
     # Crear gráfica
     plt.rcdefaults()
-    fig, ax = plt.subplots(figsize=dim_figura)
-    y_pos = np.arange(len(df["frecuencia"]))
-    ax.barh(y_pos, df["frecuencia"], align="center")
-    ax.set_yticks(y_pos)
-    ax.set_yticklabels(df["n_grama"])
-    if titulo != "":
-        ax.set_title(titulo)
-    ax.set_xlabel("Frecuencia")
-    ax.set_ylabel("Término")
-    plt.tight_layout()
-    #
-    for i, v in enumerate(df["frecuencia"]):
-        ax.text(v, i, v, fontsize=10, verticalalignment="center")
+    fig = plt.figure(figsize=dim_figura)
+    _dibujar_barchart(fig, dict_datos, titulo, ascendente)
     # Si se dio una ubicación, se guarda ahí la figura
-    if ubicacion_archivo != "":
-        plt.savefig(ubicacion_archivo)
+    if ubicacion_archivo is not None:
+        fig.savefig(ubicacion_archivo)
     if graficar:
         plt.show()
     if devolver_grafica:
@@ -687,8 +1276,10 @@ def graficar_dispersion(
     :param documentos: Texto del documento o lista de textos de \
         documentos sobre los cuales se quiere analizar la dispersión de \
         términos. Si desea generar la dispersión con n-gramas, cada texto \
-        debe ser representado como lista de n-gramas.
-    :type documentos: str, list
+        debe ser representado como lista de n-gramas. También puede ser un \
+        objeto de la clase `Corpus`, cuyos tokens se utilizan sin volver a \
+        procesar los textos.
+    :type documentos: str, list, Corpus
     :param palabras_clave: Lista de palabras clave, n-gramas claves \
         o término de interés\
         que se quieren encontrar en los textos de los documentos.
@@ -792,3 +1383,165 @@ def graficar_dispersion(
         return fig
     else:
         visualizador.graficar()
+
+
+def _figura_nube(
+    dim_figura=(10, 10), titulo="Términos más frecuentes", **kwargs
+):
+    """
+    Construye la figura de una nube de palabras. Los demás parámetros son \
+    los de la función `nube_palabras`.
+
+    :return: (tuple) Figura y opciones de exportación.
+    """
+    nube = nube_palabras(devolver_nube=True, **kwargs)
+    fig = Figure(figsize=dim_figura)
+    _dibujar_nube(fig, nube, titulo)
+    return fig, {}
+
+
+def _figura_par_nubes(
+    texto, n1=1, n2=2, dim_figura=(20, 11), aproximado=False, plantilla=None
+):
+    """
+    Construye la figura de un par de nubes de palabras. Ver la función \
+    `par_nubes`.
+
+    :return: (tuple) Figura y opciones de exportación.
+    """
+    fig = Figure(figsize=dim_figura)
+    _dibujar_par_nubes(fig, texto, n1, n2, aproximado, plantilla)
+    return fig, {}
+
+
+def _figura_barchart(
+    texto,
+    n_grama=1,
+    dim_figura=(8, 5),
+    titulo="Términos más frecuentes",
+    ascendente=True,
+    n_terminos=15,
+    aproximado=False,
+):
+    """
+    Construye la figura de un gráfico de barras de frecuencias. Ver la \
+    función `grafica_barchart_frecuencias`.
+
+    :return: (tuple) Figura y opciones de exportación.
+    """
+    dict_datos = _frecuencias_grafica(
+        texto, n_grama, n_terminos, aproximado
+    )
+    fig = Figure(figsize=dim_figura)
+    _dibujar_barchart(fig, dict_datos, titulo, ascendente)
+    return fig, {}
+
+
+def _figura_coocurrencias(
+    mat,
+    n_nodos=0,
+    titulo="Gráfico de co-ocurrencias",
+    dim_figura=(10, 6),
+    offset_y=0.09,
+    **kwargs,
+):
+    """
+    Construye la figura de un gráfico de coocurrencias. Los demás \
+    parámetros son los de la función `graficar_coocurrencias`.
+
+    :return: (tuple) Figura y opciones de exportación.
+    """
+    from contexto.utils import coocurrence_plot as cp
+
+    G = cp.construir_grafo(mat, n_nodos)
+    fig = Figure(figsize=dim_figura)
+    cp.dibujar_coocurencia(
+        fig,
+        fig.add_subplot(),
+        G,
+        titulo=titulo,
+        offset_y=offset_y,
+        **kwargs,
+    )
+    return fig, cp.OPCIONES_GUARDADO
+
+
+# Funciones que construyen la figura de cada tipo de gráfica del lote. Cada
+# una devuelve la figura y las opciones con las que se debe exportar
+GRAFICAS_LOTE = {
+    "nube": _figura_nube,
+    "par_nubes": _figura_par_nubes,
+    "barras": _figura_barchart,
+    "coocurrencias": _figura_coocurrencias,
+}
+
+
+def _exportar_grafica(especificacion):
+    """
+    Construye y exporta una gráfica del lote, sin utilizar `pyplot`.
+
+    :param especificacion: Especificación de la gráfica. Ver la función \
+        `graficar_lote`.
+    :type especificacion: dict
+    :return: (str) Ruta del archivo exportado.
+    """
+    parametros = dict(especificacion)
+    tipo = parametros.pop("tipo")
+    ubicacion_archivo = parametros.pop("ubicacion_archivo")
+    fig, opciones = GRAFICAS_LOTE[tipo](**parametros)
+    # La figura se asocia directamente a un lienzo Agg, por lo que no
+    # depende del backend de la interfaz gráfica
+    FigureCanvasAgg(fig)
+    fig.savefig(ubicacion_archivo, **opciones)
+    return ubicacion_archivo
+
+
+def graficar_lote(especificaciones, n_procesos=None):
+    """
+    Genera y exporta un lote de gráficas (nubes de palabras, pares de \
+    nubes, gráficos de barras y gráficos de coocurrencias), repartiéndolas \
+    entre varios procesos. Las figuras se crean con \
+    `matplotlib.figure.Figure` y se dibujan con el backend Agg, sin \
+    utilizar el estado global de `pyplot` ni mostrarlas en pantalla, por \
+    lo que es seguro generarlas en paralelo. El formato de cada archivo \
+    (png, svg, jpg, pdf, etc.) se define por su extensión.
+
+    :param especificaciones: Lista de diccionarios, uno por gráfica. Cada \
+        diccionario debe tener las llaves `'tipo'` (`'nube'`, \
+        `'par_nubes'`, `'barras'` o `'coocurrencias'`) y \
+        `'ubicacion_archivo'`. Las demás llaves son los parámetros de la \
+        función correspondiente (`nube_palabras`, `par_nubes`, \
+        `grafica_barchart_frecuencias` o `graficar_coocurrencias`), sin \
+        incluir los parámetros de visualización y devolución de la \
+        gráfica. Por ejemplo, \
+        `{'tipo': 'nube', 'texto': texto, 'ubicacion_archivo': 'nube.png'}`.
+    :type especificaciones: list
+    :param n_procesos: Número de procesos que generan las gráficas. Si \
+        `n_procesos = None`, se utiliza el número de núcleos de la \
+        máquina. Si `n_procesos = 1`, las gráficas se generan en el \
+        proceso actual. Valor por defecto `None`.
+    :type n_procesos: int, opcional
+    :return: (list) Lista con las rutas de los archivos exportados, en el \
+        mismo orden de `especificaciones`.
+    """
+    especificaciones = list(especificaciones)
+    for especificacion in especificaciones:
+        tipo = especificacion.get("tipo")
+        if tipo not in GRAFICAS_LOTE:
+            print(
+                f"El tipo de gráfica '{tipo}' no es válido. Los tipos "
+                f"válidos son: {', '.join(GRAFICAS_LOTE)}."
+            )
+            return None
+        if especificacion.get("ubicacion_archivo") is None:
+            print(
+                "Todas las gráficas deben tener el parámetro "
+                "'ubicacion_archivo'."
+            )
+            return None
+    if n_procesos is None:
+        n_procesos = os.cpu_count()
+    if n_procesos <= 1 or len(especificaciones) <= 1:
+        return [_exportar_grafica(e) for e in especificaciones]
+    with ProcessPoolExecutor(max_workers=n_procesos) as ejecutor:
+        return list(ejecutor.map(_exportar_grafica, especificaciones))
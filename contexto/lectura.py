@@ -3,13 +3,27 @@ Código, funciones y clases relacionadas a la carga y lectura de
 diferentes tipos de archivo (word, txt, rtf, pdf, png, jpg inicialmente).
 """
 import os
+from glob import glob
 from utils.auxiliares import verificar_crear_dir, adecuar_xml
 
+# Extensiones de archivo que la clase Lector sabe leer
+EXTENSIONES_SOPORTADAS = [
+    "txt",
+    "csv",
+    "pdf",
+    "rtf",
+    "doc",
+    "docx",
+    "png",
+    "jpg",
+    "jpeg",
+]
+
 # Clase lector
 
 
 class Lector:
-    def __init__(self, ubicacion_archivo):
+    def __init__(self, ubicacion_archivo, cache=None):
         """
         Constructor por defecto de la clase `Lector`. Esta clase se encarga \
         de extraer el texto de archivos de distintos tipos como Word, PDF, \
@@ -17,8 +31,15 @@ class Lector:
 
         :param ubicacion_archivo: Ruta del archivo que se desea leer.
         :type ubicacion_archivo: str
+        :param cache: Caché en disco donde se guarda y se consulta el texto \
+            extraído con el método `archivo_a_texto`. Puede ser un objeto \
+            de la clase `CacheExtraccion` o la ruta de la carpeta de la \
+            caché. Si es `None`, no se utiliza caché. Valor por defecto \
+            `None`.
+        :type cache: CacheExtraccion, str, opcional
         """
         self.establecer_ubicacion(ubicacion_archivo)
+        self.establecer_cache(cache)
 
     def establecer_ubicacion(self, ubicacion_archivo):
         """
@@ -29,6 +50,21 @@ class Lector:
         """
         self.ubicacion_archivo = ubicacion_archivo
 
+    def establecer_cache(self, cache):
+        """
+        Define la caché en disco donde se guarda y se consulta el texto \
+        extraído de los archivos.
+
+        :param cache: Objeto de la clase `CacheExtraccion` o ruta de la \
+            carpeta de la caché. Si es `None`, no se utiliza caché.
+        :type cache: CacheExtraccion, str
+        """
+        if isinstance(cache, str):
+            from utils.cache import CacheExtraccion
+
+            cache = CacheExtraccion(cache)
+        self.cache = cache
+
     def leer_txt(self, encoding="utf-8"):
         """
         Se lleva a cabo la lectura del texto de archivos con extensión `.txt`.
@@ -76,9 +112,6 @@ class Lector:
         if por_paginas:
             from auxiliares import word_a_pdf
 
-            # El atributo 'ubicacion_archivo' se va a cambiar
-            # temporalmente, por lo que se guarda el valor original.
-            temp = self.ubicacion_archivo
             archivo_pdf = word_a_pdf(self.ubicacion_archivo)
             if archivo_pdf is None:
                 print(
@@ -88,12 +121,16 @@ class Lector:
                     )
                 )
             else:
-                self.establecer_ubicacion(archivo_pdf)
-                paginas = self.leer_pdf(por_paginas, False, 0, "", 0, 0)
-                # Volver a establecer la ubicacion de archivo original
-                self.establecer_ubicacion(temp)
-                # Borrar el archivo PDF creado temporalmente
-                os.remove(archivo_pdf)
+                # Se usa otro lector para no modificar la ubicación de este,
+                # que puede estar siendo usado desde otro hilo
+                try:
+                    lector_pdf = Lector(archivo_pdf)
+                    paginas = lector_pdf.leer_pdf(
+                        por_paginas, False, 0, "", 0, 0
+                    )
+                finally:
+                    # Borrar el archivo PDF creado temporalmente
+                    os.remove(archivo_pdf)
                 return paginas
         import docx2txt
 
@@ -114,6 +151,7 @@ class Lector:
         psm=3,
         password=None,
         enderezar=False,
+        n_hilos=None,
     ):
         """
         Lectura de texto de archivos con extensión `.pdf`.
@@ -125,9 +163,11 @@ class Lector:
         :type por_paginas: bool, opcional
         :param ocr: Especifica si se desea utilizar reconocimiento óptico \
             de caracteres (OCR) sobre el archivo pdf. Se utiliza usualmente \
-            cuando el archivo es una imagen o documento escaneado. Valor por \
-            defecto `False`.
-        :type ocr: bool, opcional
+            cuando el archivo es una imagen o documento escaneado. Si \
+            `ocr = 'auto'`, se extrae la capa de texto de cada página y \
+            solo se aplica OCR a las páginas cuyo texto no es utilizable \
+            (por ejemplo, páginas escaneadas). Valor por defecto `False`.
+        :type ocr: {True, False, 'auto'}, opcional
         :param preprocesamiento: Especifica el nivel de preprocesamiento que \
             se lleva a cabo antes de extraer el texto del archivo. Aplica \
             cuando `ocr = True`. Las opciones son las siguientes: \
@@ -169,13 +209,22 @@ class Lector:
             `ocr = True` y `preprocesamiento` este entre `1` y `5`. Valor \
             por defecto `False`.
         :type enderezar: bool, opcional
+        :param n_hilos: Número de páginas que se procesan al mismo tiempo \
+            cuando `ocr = True`. Si es `None`, se utiliza el número de \
+            núcleos del equipo. Valor por defecto `None`.
+        :type n_hilos: int, opcional
         :return: (str) Texto del archivo '.pdf' leído con la clase `Lector`.
         """
-        if ocr:
+        if ocr and ocr != "auto":
             from utils.ocr import OCR
 
             recog = OCR(
-                preprocesamiento, lenguaje, oem, psm, enderezar=enderezar
+                preprocesamiento,
+                lenguaje,
+                oem,
+                psm,
+                enderezar=enderezar,
+                n_hilos=n_hilos,
             )
             paginas = recog.pdf_a_texto(self.ubicacion_archivo)
         else:
@@ -187,12 +236,179 @@ class Lector:
                 from utils.auxiliares import leer_pdf_pypdf
 
                 paginas = leer_pdf_pypdf(self.ubicacion_archivo, password)
+            # En modo automático, solo se aplica OCR a las páginas que no
+            # tienen una capa de texto utilizable
+            if ocr == "auto":
+                from utils.auxiliares import texto_pagina_valido
+
+                paginas = list(paginas)
+                sin_texto = [
+                    i + 1
+                    for i, pagina in enumerate(paginas)
+                    if not texto_pagina_valido(pagina)
+                ]
+                if len(sin_texto) > 0:
+                    from utils.ocr import OCR
+
+                    recog = OCR(
+                        preprocesamiento,
+                        lenguaje,
+                        oem,
+                        psm,
+                        enderezar=enderezar,
+                        n_hilos=n_hilos,
+                    )
+                    textos_ocr = recog.paginas_a_texto(
+                        self.ubicacion_archivo, sin_texto
+                    )
+                    for num_pagina, texto in zip(sin_texto, textos_ocr):
+                        paginas[num_pagina - 1] = texto
         # Se define la forma de retornar el texto
         if por_paginas:
             return paginas
         else:
             return " ".join(paginas)
 
+    def iterar_paginas(
+        self,
+        tipo="inferir",
+        ocr=False,
+        preprocesamiento=3,
+        lenguaje="es",
+        oem=2,
+        psm=3,
+        password=None,
+        enderezar=False,
+        n_hilos=None,
+        tam_ventana=None,
+        encoding="utf-8",
+    ):
+        """
+        Extrae el texto de un archivo página por página. A diferencia de \
+        `archivo_a_texto` con `por_paginas = True`, el texto de cada página \
+        se entrega apenas está disponible, sin esperar a que se procese el \
+        documento completo y sin mantener todas las páginas en memoria. \
+        Aplica para archivos PDF y Word; para los demás tipos de archivo \
+        se entrega el texto completo como una sola página.
+
+        :param tipo: Se define el tipo (o extensión) del archivo que se \
+            desea leer. Valor por defecto `'inferir'`.
+        :type tipo: {'inferir', 'txt', 'csv', 'pdf', 'rtf', 'doc', \
+            'docx', 'png', 'jpg', 'jpeg'}, opcional
+        :param ocr: Especifica si se desea utilizar reconocimiento óptico \
+            de caracteres (OCR) sobre el archivo. Si `ocr = 'auto'`, solo \
+            se aplica OCR a las páginas de archivos PDF que no tienen una \
+            capa de texto utilizable. Valor por defecto `False`.
+        :type ocr: {True, False, 'auto'}, opcional
+        :param preprocesamiento: Especifica el nivel de preprocesamiento que \
+            se lleva a cabo antes de extraer el texto del archivo, cuando \
+            se aplica OCR. Para mayor información, consultar el método \
+            `leer_pdf`. Valor por defecto `3`.
+        :type preprocesamiento: {1, 2, 3, 4, 5}, opcional
+        :param lenguaje: Define el lenguaje del texto que se desea \
+            extraer. Para mayor información, consultar la sección de \
+            :ref:`Lenguajes soportados <seccion_lenguajes_soportados>`. \
+            Valor por defecto `'es'`.
+        :type lenguaje: {'es', 'en', 'fr', 'ge'}, opcional
+        :param oem: modo del motor OCR (OCR Engine mode en inglés). Para \
+            mayor información, consultar la sección de \
+            :ref:`OCR <seccion_ocr>`. Valor por defecto `2`.
+        :type oem: {0, 1, 2, 3}, opcional
+        :param psm:  Modo de segmentación de las páginas (page segmentation \
+            modes, en inglés) de la librería `Pytesseract`. Para mayor \
+            información consultar la sección de :ref:`OCR <seccion_ocr>`. \
+            Valor por defecto `3`.
+        :type psm: {0, 1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 11, 12, 13}, opcional
+        :param password: Contraseña del documento PDF que se quiere leer, en \
+            caso de que se necesite. Valor por defecto `None`.
+        :type password: str, opcional
+        :param enderezar: Permite enderezar el texto en la imagen para \
+            obtener mejores resultados cuando se aplica OCR. Valor por \
+            defecto `False`.
+        :type enderezar: bool, opcional
+        :param n_hilos: Número de páginas que se procesan al mismo tiempo \
+            cuando se aplica OCR. Si es `None`, se utiliza el número de \
+            núcleos del equipo. Valor por defecto `None`.
+        :type n_hilos: int, opcional
+        :param tam_ventana: Número de páginas que se convierten a imagen a \
+            la vez cuando `ocr = True`. Si es `None`, se utiliza el valor de \
+            `n_hilos`. Valor por defecto `None`.
+        :type tam_ventana: int, opcional
+        :param encoding: Especifica la codificación del texto que se desea \
+            leer, para archivos `.txt` y `.csv`. Valor por defecto `'utf-8'`.
+        :type encoding: str, opcional
+        :return: (generator) Generador que entrega el texto de cada página \
+            del archivo, en orden.
+        """
+        tipo = tipo.lower()
+        if tipo == "inferir":
+            tipo = self.ubicacion_archivo.split(".")[-1].lower()
+        if tipo in ["doc", "docx"]:
+            from utils.auxiliares import word_a_pdf
+
+            archivo_pdf = word_a_pdf(self.ubicacion_archivo)
+            if archivo_pdf is None:
+                print(
+                    (
+                        "No se pudo convertir el documento Word a PDF, por lo"
+                        " que se retornará el texto completo y no por páginas."
+                    )
+                )
+                yield self.leer_word(False, False)
+                return
+            try:
+                # Los documentos Word tienen capa de texto, por lo que no se
+                # aplica OCR sobre el PDF generado
+                lector_pdf = Lector(archivo_pdf)
+                yield from lector_pdf.iterar_paginas("pdf", password=password)
+            finally:
+                # Borrar el archivo PDF creado temporalmente
+                os.remove(archivo_pdf)
+        elif tipo == "pdf":
+            recog = None
+            if ocr:
+                from utils.ocr import OCR
+
+                recog = OCR(
+                    preprocesamiento,
+                    lenguaje,
+                    oem,
+                    psm,
+                    enderezar=enderezar,
+                    n_hilos=n_hilos,
+                )
+            if ocr and ocr != "auto":
+                paginas = recog.iterar_pdf(self.ubicacion_archivo, tam_ventana)
+                for pagina in paginas:
+                    yield adecuar_xml(pagina)
+            else:
+                from utils.auxiliares import (
+                    iterar_pdf_pypdf,
+                    texto_pagina_valido,
+                )
+
+                paginas = iterar_pdf_pypdf(self.ubicacion_archivo, password)
+                for i, pagina in enumerate(paginas):
+                    if ocr == "auto" and not texto_pagina_valido(pagina):
+                        pagina = recog.paginas_a_texto(
+                            self.ubicacion_archivo, [i + 1]
+                        )[0]
+                    yield adecuar_xml(pagina)
+        else:
+            salida = self.archivo_a_texto(
+                tipo,
+                encoding=encoding,
+                ocr=ocr,
+                preprocesamiento=preprocesamiento,
+                lenguaje=lenguaje,
+                oem=oem,
+                psm=psm,
+                password=password,
+                enderezar=enderezar,
+            )
+            if salida is not None:
+                yield salida
+
     def leer_rtf(self):
         """
         Lectura de texto de archivos con extensión `.rtf`.
@@ -282,6 +498,7 @@ class Lector:
         psm=3,
         password=None,
         enderezar=False,
+        n_hilos=None,
     ):
         """
         Lee el texto de un archivo y permite escoger el tipo de archivo, \
@@ -312,9 +529,11 @@ class Lector:
         :type encoding: str, opcional
         :param ocr: Especifica si se desea utilizar reconocimiento óptico \
             de caracteres (OCR) sobre el archivo. Se utiliza usualmente \
-            cuando el archivo es una imagen o documento escaneado. Valor por \
+            cuando el archivo es una imagen o documento escaneado. Para \
+            archivos PDF, si `ocr = 'auto'` solo se aplica OCR a las \
+            páginas que no tienen una capa de texto utilizable. Valor por \
             defecto `False`.
-        :type ocr: bool, opcional
+        :type ocr: {True, False, 'auto'}, opcional
         :param preprocesamiento: Especifica el nivel de preprocesamiento que \
             se lleva a cabo antes de extraer el texto del archivo. Aplica \
             cuando `ocr = True`. Las opciones son las siguientes: \
@@ -352,11 +571,35 @@ class Lector:
             resultados durante el proceso de extracción de texto. Este \
             parámetro solo se utiliza cuando se aplica OCR y el parámetro \
             preprocesamiento está entre 1 y 5.
+        :param n_hilos: (int) Valor por defecto: None. Número de páginas \
+            que se procesan al mismo tiempo cuando se aplica OCR sobre un \
+            archivo PDF. Si es None, se utiliza el número de núcleos del \
+            equipo.
         :return: (str) Texto extraído del archivo con la clase `Lector`.
         """
         tipo = tipo.lower()
         if tipo == "inferir":
             tipo = self.ubicacion_archivo.split(".")[-1].lower()
+        # Si hay caché, se busca un resultado previo para el mismo contenido
+        # de archivo y los mismos parámetros. Si se extraen los medios del
+        # archivo no se usa la caché, porque se deben generar las imágenes
+        llave = None
+        if self.cache is not None and not extraer_medios:
+            parametros = {
+                "tipo": tipo,
+                "por_paginas": por_paginas,
+                "encoding": encoding,
+                "ocr": ocr,
+                "preprocesamiento": preprocesamiento,
+                "lenguaje": lenguaje,
+                "oem": oem,
+                "psm": psm,
+                "enderezar": enderezar,
+            }
+            llave = self.cache.llave(self.ubicacion_archivo, parametros)
+            salida = self.cache.obtener(llave)
+            if salida is not None:
+                return salida
         if tipo in ["txt", "csv"]:
             salida = self.leer_txt(encoding)
         elif tipo == "pdf":
@@ -369,15 +612,17 @@ class Lector:
                 psm,
                 password,
                 enderezar,
+                n_hilos,
             )
         elif tipo == "rtf":
             salida = self.leer_rtf()
         elif tipo in ["doc", "docx"]:
             salida = self.leer_word(por_paginas, extraer_medios, dir_medios)
         elif tipo in ["png", "jpg", "jpeg"]:
-            return self.leer_imagen(
+            salida = self.leer_imagen(
                 preprocesamiento, lenguaje, oem, psm, enderezar
             )
+            return self._guardar_cache(llave, salida)
         else:
             print(
                 (
@@ -390,9 +635,25 @@ class Lector:
         if salida is None:
             return None
         elif isinstance(salida, str):
-            return adecuar_xml(salida)
+            salida = adecuar_xml(salida)
         else:
-            return [adecuar_xml(i) for i in salida]
+            salida = [adecuar_xml(i) for i in salida]
+        return self._guardar_cache(llave, salida)
+
+    def _guardar_cache(self, llave, salida):
+        """
+        Guarda en la caché el texto extraído, si se está utilizando una.
+
+        :param llave: Llave del resultado en la caché, o `None` si no se \
+            utiliza caché.
+        :type llave: str
+        :param salida: Texto extraído del archivo.
+        :type salida: str, list
+        :return: (str, list) El mismo texto de entrada.
+        """
+        if llave is not None and salida is not None:
+            self.cache.guardar(llave, salida)
+        return salida
 
 
 # Función que encapsula el proceso de lectura de archivos de texto
@@ -412,6 +673,8 @@ def leer_texto(
     psm=3,
     password=None,
     enderezar=False,
+    n_hilos=None,
+    cache=None,
 ):
     """
     Función que se encarga de extraer el texto de un archivo. Permite \
@@ -441,9 +704,10 @@ def leer_texto(
     :type encoding: str, opcional
     :param ocr: Especifica si se desea utilizar reconocimiento óptico de \
         caracteres sobre el texto se quiere extraer. Se utiliza usualmente \
-        cuando el archivo es una imagen o documento escaneado. Valor por \
-        defecto `False`.
-    :type ocr: bool, opcional
+        cuando el archivo es una imagen o documento escaneado. Para \
+        archivos PDF, si `ocr = 'auto'` solo se aplica OCR a las páginas \
+        que no tienen una capa de texto utilizable. Valor por defecto `False`.
+    :type ocr: {True, False, 'auto'}, opcional
     :param preprocesamiento: Especifica el nivel de preprocesamiento que se \
         lleva a cabo antes de extraer el texto del archivo. Aplica cuando se \
         utiliza reconocimiento óptico de caracteres ( `ocr = True`). Las \
@@ -486,10 +750,19 @@ def leer_texto(
             `ocr = True` y `preprocesamiento` este entre `1` y `5`. Valor \
             por defecto `False`.
     :type enderezar: bool, opcional
+    :param n_hilos: Número de páginas que se procesan al mismo tiempo \
+            cuando `ocr = True`. Si es `None`, se utiliza el número de \
+            núcleos del equipo. Valor por defecto `None`.
+    :type n_hilos: int, opcional
+    :param cache: Caché en disco (objeto de la clase `CacheExtraccion` o \
+            ruta de su carpeta) donde se consulta y se guarda el texto \
+            extraído. Si el archivo ya fue leído con los mismos parámetros, \
+            se devuelve el resultado guardado. Valor por defecto `None`.
+    :type cache: CacheExtraccion, str, opcional
     :return: (str) Texto extraído del archivo especificado con la función \
         'leer_texto'.
     """
-    le = Lector(ubicacion_archivo)
+    le = Lector(ubicacion_archivo, cache)
     return le.archivo_a_texto(
         tipo,
         extraer_medios,
@@ -503,4 +776,185 @@ def leer_texto(
         psm,
         password,
         enderezar,
+        n_hilos,
     )
+
+
+# Funciones para la lectura de varios archivos a la vez
+
+
+def _leer_archivo(ubicacion_archivo, parametros):
+    """
+    Función auxiliar que lee un archivo con la función `leer_texto`, sin \
+    detener el proceso si ocurre algún error. Se define a nivel de módulo \
+    para que pueda ser enviada a los procesos de trabajo.
+
+    :param ubicacion_archivo: Ruta del archivo que se desea leer.
+    :type ubicacion_archivo: str
+    :param parametros: Parámetros adicionales de la función `leer_texto`.
+    :type parametros: dict
+    :return: (tuple) Tupla de la forma `(ubicacion_archivo, texto, error)`. \
+        Si la lectura fue exitosa, `error` es `None`; en caso contrario, \
+        `texto` es `None` y `error` contiene la descripción del error.
+    """
+    try:
+        texto = leer_texto(ubicacion_archivo, **parametros)
+        return ubicacion_archivo, texto, None
+    except (Exception, SystemExit) as e:
+        return ubicacion_archivo, None, f"{type(e).__name__}: {e}"
+
+
+def listar_archivos(ubicacion, recursivo=False, extensiones=None):
+    """
+    Genera la lista de archivos que se desean leer a partir de un \
+    directorio, un patrón de búsqueda (*glob*) o una lista de rutas.
+
+    :param ubicacion: Ruta de un directorio, patrón de búsqueda (por \
+        ejemplo `'documentos/*.pdf'`) o lista de rutas de archivos.
+    :type ubicacion: str, list
+    :param recursivo: Indica si se deben incluir los archivos de las \
+        subcarpetas del directorio, o si el patrón de búsqueda admite \
+        `'**'`. Valor por defecto `False`.
+    :type recursivo: bool, opcional
+    :param extensiones: Lista de extensiones de archivo que se desean \
+        incluir. Si es `None`, se incluyen todas las extensiones que \
+        soporta la clase `Lector`. Valor por defecto `None`.
+    :type extensiones: list, opcional
+    :return: (list) Lista de rutas de los archivos encontrados.
+    """
+    if extensiones is None:
+        extensiones = EXTENSIONES_SOPORTADAS
+    extensiones = [e.lower().strip(".") for e in extensiones]
+    if isinstance(ubicacion, str):
+        if os.path.isdir(ubicacion):
+            if recursivo:
+                archivos = [
+                    os.path.join(raiz, a)
+                    for raiz, _, nombres in os.walk(ubicacion)
+                    for a in nombres
+                ]
+            else:
+                archivos = [
+                    os.path.join(ubicacion, a) for a in os.listdir(ubicacion)
+                ]
+        else:
+            archivos = glob(ubicacion, recursive=recursivo)
+        # Se ordenan para que el resultado no dependa del sistema de archivos
+        archivos = sorted(a for a in archivos if os.path.isfile(a))
+    else:
+        archivos = list(ubicacion)
+    return [a for a in archivos if a.split(".")[-1].lower() in extensiones]
+
+
+def leer_directorio(
+    ubicacion,
+    recursivo=False,
+    extensiones=None,
+    n_procesos=None,
+    devolver_generador=False,
+    **kwargs,
+):
+    """
+    Extrae el texto de varios archivos a la vez, repartiendo la lectura \
+    entre varios procesos. Los archivos pueden especificarse como un \
+    directorio, un patrón de búsqueda (*glob*) o una lista de rutas, y \
+    se agrupan según su tipo (inferido a partir de la extensión) antes de \
+    ser repartidos. Si la lectura de un archivo falla, el error se reporta \
+    en el resultado de ese archivo y se continúa con los demás.
+
+    :param ubicacion: Ruta de un directorio, patrón de búsqueda (por \
+        ejemplo `'documentos/**/*.pdf'`) o lista de rutas de archivos.
+    :type ubicacion: str, list
+    :param recursivo: Indica si se deben incluir los archivos de las \
+        subcarpetas del directorio, o si el patrón de búsqueda admite \
+        `'**'`. Valor por defecto `False`.
+    :type recursivo: bool, opcional
+    :param extensiones: Lista de extensiones de archivo que se desean \
+        leer. Si es `None`, se leen todas las extensiones que soporta la \
+        clase `Lector`. Valor por defecto `None`.
+    :type extensiones: list, opcional
+    :param n_procesos: Número de procesos que se utilizan para leer los \
+        archivos. Si es `None`, se utiliza el número de núcleos del equipo. \
+        Si es `1`, los archivos se leen uno a uno en el proceso actual. \
+        Valor por defecto `None`.
+    :type n_procesos: int, opcional
+    :param devolver_generador: Si es `False`, se devuelve una lista con los \
+        resultados en el mismo orden de los archivos de entrada. Si es \
+        `True`, se devuelve un generador que entrega cada resultado a \
+        medida que termina su lectura. Valor por defecto `False`.
+    :type devolver_generador: bool, opcional
+    :param kwargs: Parámetros adicionales de la función `leer_texto` \
+        (por ejemplo `por_paginas`, `ocr` o `lenguaje`), que se aplican \
+        a todos los archivos.
+    :type kwargs: dict, opcional
+    :return: (list, generator) Resultados de la lectura, donde cada \
+        elemento es una tupla de la forma `(ubicacion_archivo, texto, \
+        error)`. Si la lectura fue exitosa, `error` es `None`; en caso \
+        contrario, `texto` es `None` y `error` contiene la descripción \
+        del error.
+    """
+    archivos = listar_archivos(ubicacion, recursivo, extensiones)
+    if kwargs.get("tipo", "inferir") != "inferir":
+        tipos = [kwargs["tipo"]] * len(archivos)
+    else:
+        tipos = [a.split(".")[-1].lower() for a in archivos]
+    # Se agrupan los archivos por tipo, para que cada proceso trabaje en
+    # lo posible sobre archivos que se leen de la misma manera
+    orden = sorted(range(len(archivos)), key=lambda i: tipos[i])
+    salida = _iterar_lectura(archivos, orden, n_procesos, kwargs)
+    if devolver_generador:
+        return (resultado for _, resultado in salida)
+    # Se devuelven los resultados en el orden original de los archivos
+    resultados = [None] * len(archivos)
+    for i, resultado in salida:
+        resultados[i] = resultado
+    return resultados
+
+
+def _iterar_lectura(archivos, orden, n_procesos, parametros):
+    """
+    Generador auxiliar que lee los archivos en el orden indicado y \
+    entrega los resultados a medida que terminan.
+
+    :param archivos: Lista de rutas de los archivos.
+    :type archivos: list
+    :param orden: Orden en el que se envían los archivos a leer.
+    :type orden: list
+    :param n_procesos: Número de procesos a utilizar.
+    :type n_procesos: int
+    :param parametros: Parámetros adicionales de la función `leer_texto`.
+    :type parametros: dict
+    :return: (generator) Tuplas de la forma `(indice, resultado)`, donde \
+        `indice` es la posición del archivo en la lista de entrada.
+    """
+    if n_procesos == 1 or len(archivos) < 2:
+        for i in orden:
+            yield i, _leer_archivo(archivos[i], parametros)
+        return
+    from concurrent.futures import (
+        FIRST_COMPLETED,
+        ProcessPoolExecutor,
+        wait,
+    )
+
+    if n_procesos is None:
+        n_procesos = os.cpu_count()
+    with ProcessPoolExecutor(max_workers=n_procesos) as ejecutor:
+        # Se limita el número de lecturas pendientes, y cada futuro se
+        # descarta al entregar su resultado, para que los textos leídos no
+        # se acumulen en memoria
+        pendientes = {}
+        orden = iter(orden)
+        while True:
+            for i in orden:
+                futuro = ejecutor.submit(
+                    _leer_archivo, archivos[i], parametros
+                )
+                pendientes[futuro] = i
+                if len(pendientes) >= 2 * n_procesos:
+                    break
+            if not pendientes:
+                break
+            listos, _ = wait(pendientes, return_when=FIRST_COMPLETED)
+            for futuro in listos:
+                yield pendientes.pop(futuro), futuro.result()
@@ -1,7 +1,121 @@
+import os
 import re
 import unicodedata
-import pkg_resources
-from utils.tokenizacion import tokenizar, destokenizar
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache, partial
+from utils.tokenizacion import tokenizador_defecto, tokenizar, destokenizar
+
+# Expresiones regulares de la limpieza, compiladas una sola vez.
+# RegEx de caracteres adaptada de https://stackoverflow.com/a/56280214
+RE_CARACTERES = re.compile(r"[^ a-zA-ZÀ-ÖØ-öø-ÿ]+")
+RE_CARACTERES_NUMEROS = re.compile(r"[^ a-zA-ZÀ-ÖØ-öø-ÿ0-9]+")
+RE_ESPACIOS = re.compile(r" +")
+
+# Número mínimo de textos para que valga la pena repartirlos entre varios
+# procesos. Con menos textos, el costo de crear los procesos es mayor que
+# el tiempo que se ahorra
+MIN_TEXTOS_PARALELO = 1000
+
+# Carpeta con las listas de palabras que vienen con la librería
+DIR_LISTAS = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "data", "listas_stopwords"
+)
+
+
+class TablaTraduccion(dict):
+    """
+    Tabla de traducción para el método `str.translate`, que calcula el \
+    reemplazo de cada carácter con una función, la primera vez que lo \
+    encuentra, y lo guarda para las siguientes. Los caracteres del rango \
+    Latin-1 y Latin Extendido (hasta U+024F) se calculan al crear la tabla.
+    """
+
+    def __init__(self, funcion, ultimo_precalculado=0x24F):
+        """
+        Constructor de la clase `TablaTraduccion`.
+
+        :param funcion: Función que recibe un carácter y devuelve el texto \
+            por el que se debe reemplazar.
+        :type funcion: callable
+        :param ultimo_precalculado: Último punto de código que se calcula \
+            al crear la tabla. Valor por defecto `0x24F`.
+        :type ultimo_precalculado: int, opcional
+        """
+        super().__init__()
+        self.funcion = funcion
+        for codigo in range(ultimo_precalculado + 1):
+            self[codigo] = funcion(chr(codigo))
+
+    def __missing__(self, codigo):
+        reemplazo = self.funcion(chr(codigo))
+        self[codigo] = reemplazo
+        return reemplazo
+
+
+def _quitar_acentos_caracter(caracter):
+    """
+    Quita los acentos de un carácter. Se descompone el carácter (forma \
+    NFD) y solo se conservan las partes ASCII, igual que en la función \
+    `remover_acentos`.
+
+    :param caracter: Carácter de entrada.
+    :type caracter: str
+    :return: (str) Carácter sin acentos, o texto vacío si el carácter no \
+        tiene un equivalente ASCII.
+    """
+    descompuesto = unicodedata.normalize("NFD", caracter)
+    return descompuesto.encode("ascii", "ignore").decode("ascii")
+
+
+def _normalizar_caracter(
+    caracter, quitar_numeros=True, ignorar_mayus=True, quitar_acentos=False
+):
+    """
+    Calcula el reemplazo de un carácter en la limpieza básica: se quitan \
+    los acentos y se pasa a minúsculas, si aplica, y los caracteres no \
+    permitidos se convierten en espacios.
+
+    :param caracter: Carácter de entrada.
+    :type caracter: str
+    :return: (str) Texto por el que se debe reemplazar el carácter.
+    """
+    if quitar_acentos:
+        caracter = _quitar_acentos_caracter(caracter)
+    if ignorar_mayus:
+        caracter = caracter.lower()
+    patron = RE_CARACTERES if quitar_numeros else RE_CARACTERES_NUMEROS
+    return patron.sub(" ", caracter)
+
+
+@lru_cache(maxsize=None)
+def tabla_normalizacion(
+    quitar_numeros=True, ignorar_mayus=True, quitar_acentos=False
+):
+    """
+    Devuelve la tabla de traducción que aplica, en una sola pasada, las \
+    operaciones carácter a carácter de la limpieza básica: quitar acentos, \
+    pasar a minúsculas y reemplazar los caracteres no permitidos por \
+    espacios. Se crea una sola tabla por cada combinación de parámetros.
+
+    :param quitar_numeros: Indica si se quitan los números. Valor por \
+        defecto `True`.
+    :type quitar_numeros: bool, opcional
+    :param ignorar_mayus: Indica si se pasa el texto a minúsculas. Valor \
+        por defecto `True`.
+    :type ignorar_mayus: bool, opcional
+    :param quitar_acentos: Indica si se quitan los acentos. Valor por \
+        defecto `False`.
+    :type quitar_acentos: bool, opcional
+    :return: (TablaTraduccion) Tabla de traducción para `str.translate`.
+    """
+    return TablaTraduccion(
+        partial(
+            _normalizar_caracter,
+            quitar_numeros=quitar_numeros,
+            ignorar_mayus=ignorar_mayus,
+            quitar_acentos=quitar_acentos,
+        )
+    )
 
 
 def remover_acentos(texto):
@@ -14,10 +128,8 @@ def remover_acentos(texto):
     :type texto: str
     :return: (str) Texto sin acentos después de la limpieza.
     """
-    try:
-        texto = unicode(texto, "utf-8")
-    except NameError:
-        pass
+    # Para un texto completo, la normalización NFD (implementada en C) es
+    # más rápida que una tabla de traducción
     texto = (
         unicodedata.normalize("NFD", texto)
         .encode("ascii", "ignore")
@@ -26,12 +138,102 @@ def remover_acentos(texto):
     return str(texto)
 
 
+def _trie_a_regex(trie):
+    """
+    Convierte un trie (diccionarios anidados, donde la llave `""` marca \
+    el final de una expresión) en una expresión regular equivalente, en la \
+    que las alternativas con el mismo prefijo comparten ese prefijo.
+
+    :param trie: Trie con las expresiones.
+    :type trie: dict
+    :return: (str) Expresión regular, sin compilar.
+    """
+    final = "" in trie
+    ramas = []
+    caracteres = []
+    for caracter in sorted(c for c in trie if c != ""):
+        sub = _trie_a_regex(trie[caracter])
+        if sub:
+            ramas.append(re.escape(caracter) + sub)
+        else:
+            caracteres.append(re.escape(caracter))
+    # Las ramas que terminan en un solo carácter se agrupan en una clase
+    if len(caracteres) == 1:
+        ramas.append(caracteres[0])
+    elif len(caracteres) > 1:
+        ramas.append("[" + "".join(caracteres) + "]")
+    if len(ramas) < 1:
+        return ""
+    if len(ramas) == 1:
+        patron = ramas[0]
+    else:
+        patron = "(?:" + "|".join(ramas) + ")"
+    # Si aquí termina una expresión, el resto es opcional. Al ser un
+    # cuantificador codicioso, se prefiere la coincidencia más larga
+    if final:
+        if len(ramas) > 1:
+            patron += "?"
+        else:
+            patron = "(?:" + patron + ")?"
+    return patron
+
+
+@lru_cache(maxsize=32)
+def _compilar_expresiones(expresiones, limites_palabra):
+    trie = {}
+    for expresion in expresiones:
+        if not expresion:
+            continue
+        nodo = trie
+        for caracter in expresion:
+            nodo = nodo.setdefault(caracter, {})
+        nodo[""] = True
+    if len(trie) < 1:
+        return None
+    patron = _trie_a_regex(trie)
+    if limites_palabra:
+        patron = r"(?<!\w)" + patron + r"(?!\w)"
+    return re.compile(patron)
+
+
+def compilar_expresiones(lista_expresiones, limites_palabra=False):
+    """
+    Construye una sola expresión regular que encuentra cualquiera de las \
+    expresiones de una lista, para poder quitarlas todas de un texto en \
+    una sola pasada. La expresión se construye a partir de un trie, por lo \
+    que las expresiones con el mismo prefijo lo comparten, y en cada \
+    posición del texto se encuentra la expresión más larga posible. El \
+    resultado se guarda en memoria, por lo que compilar varias veces la \
+    misma lista no tiene costo adicional. Las tuplas se usan directamente \
+    para buscar la expresión en memoria; las listas y demás iterables se \
+    ordenan y se les quitan los elementos repetidos en cada llamado, por lo \
+    que si se compila muchas veces una lista grande se recomienda pasarla \
+    como una tupla.
+
+    :param lista_expresiones: Lista de expresiones que se desean buscar.
+    :type lista_expresiones: list, tuple
+    :param limites_palabra: Si es `True`, solo se encuentran expresiones \
+        completas, es decir, que no estén precedidas ni seguidas por una \
+        letra o número. Por ejemplo, la expresión 'san juan' no se \
+        encontraría en el texto 'san juanito'. Valor por defecto `False`.
+    :type limites_palabra: bool, opcional
+    :return: (re.Pattern) Expresión regular compilada, o `None` si la \
+        lista no tiene expresiones.
+    """
+    # El orden y los repetidos no cambian la expresión regular, solo la
+    # llave con la que se guarda en memoria
+    if not isinstance(lista_expresiones, tuple):
+        lista_expresiones = tuple(sorted(set(lista_expresiones)))
+    return _compilar_expresiones(lista_expresiones, limites_palabra)
+
+
 def remover_stopwords(
     texto,
     lista_palabras=[],
     lista_expresiones=[],
     ubicacion_archivo=None,
     tokenizador=None,
+    limites_palabra=False,
 ):
     """
     Quita las palabras y expresiones determinadas de un texto. Esta función \
@@ -43,14 +245,21 @@ def remover_stopwords(
         contenidas en `lista_palabras` y `lista_expresiones`.
     :type texto: str
     :param lista_palabras: Lista de palabras que se desean quitar del texto. \
-        Por ejemplo, la lista `['hola', 'de', 'a']` eliminará esas palabras.
-    :type lista_palabras: list, opcional
+        Por ejemplo, la lista `['hola', 'de', 'a']` eliminará esas palabras. \
+        Si se van a limpiar muchos textos con una lista grande, se \
+        recomienda pasar un `frozenset`, que se utiliza directamente sin \
+        necesidad de construir el conjunto de búsqueda en cada llamado.
+    :type lista_palabras: list, set, frozenset, opcional
     :param lista_expresiones: Lista de expresiones que se quieren quitar al \
         texto. A diferencia de `lista_palabras`, esta puede contener palabras \
         compuestas. Por ejemplo, \
         `['San juan de Dios', 'Distrito Capital, 'fuente de agua']`; esta \
-        lista quitará esas palabras compuestas del texto de entrada.
-    :type lista_expresiones: list, opcional
+        lista quitará esas palabras compuestas del texto de entrada. Si se \
+        van a limpiar muchos textos con una lista grande, se recomienda \
+        pasar una tupla, que se utiliza directamente para buscar la \
+        expresión regular ya compilada (ver la función \
+        `compilar_expresiones`).
+    :type lista_expresiones: list, tuple, opcional
     :param ubicacion_archivo: Ruta del archivo plano que contiene la \
         lista de palabras y/o lista de palabras separadas por espacios, comas \
         o saltos de línea. En caso contrario no es necesario especificar los \
@@ -61,22 +270,30 @@ def remover_stopwords(
         de textos. Si el valor es 'None', se utilizará por defecto una \
         instancia de la clase `TokenizadorNLTK`.
     :type tokenizador: Tokenizer, opcional
+    :param limites_palabra: Si es `True`, solo se quitan las expresiones \
+        de `lista_expresiones` que aparecen completas, es decir, que no \
+        están precedidas ni seguidas por una letra o número. Valor por \
+        defecto `False`.
+    :type limites_palabra: bool, opcional
     :return: (str) Texto sin las palabras y expresiones incluidas en la \
         limpieza.
     """
     if ubicacion_archivo is not None:
         lista_palabras, lista_expresiones = cargar_stopwords(ubicacion_archivo)
-    # Quitar las expresiones no deseadas
-    for expresion in set(lista_expresiones):
-        texto = texto.replace(expresion, " ")
+    # Quitar las expresiones no deseadas, todas en una sola pasada
+    patron = compilar_expresiones(lista_expresiones, limites_palabra)
+    if patron is not None:
+        texto = patron.sub(" ", texto)
     # Dejar solo las palabras que no aparecen en la lista de palabras no
-    # deseadas
+    # deseadas. El conjunto de búsqueda se construye una sola vez
+    if not isinstance(lista_palabras, (set, frozenset)):
+        lista_palabras = frozenset(lista_palabras)
     tokens = tokenizar(texto, tokenizador)
     texto = destokenizar(
-        [p for p in tokens if p not in set(lista_palabras)], tokenizador
+        [p for p in tokens if p not in lista_palabras], tokenizador
     )
     # Reemplaza espacios múltiples por un solo espacio
-    texto = re.sub(r" +", " ", texto)
+    texto = RE_ESPACIOS.sub(" ", texto)
     return texto
 
 
@@ -96,7 +313,71 @@ def remover_palabras_cortas(texto, n_min):
     return " ".join([palabra for palabra in palabras if len(palabra) >= n_min])
 
 
-def limpieza_basica(texto, quitar_numeros=True, ignorar_mayus=True):
+def procesar_lote(funcion, textos, n_procesos=1):
+    """
+    Aplica una función de limpieza a un conjunto de textos, repartiéndolos \
+    en lotes entre varios procesos. Si hay pocos textos, o si \
+    `n_procesos = 1`, los textos se procesan en el proceso actual.
+
+    :param funcion: Función que recibe una lista de textos y devuelve una \
+        lista con los textos procesados, en el mismo orden. Debe poder \
+        enviarse a otros procesos (por ejemplo, una función definida a \
+        nivel de módulo, un `functools.partial` o el método de un objeto).
+    :type funcion: callable
+    :param textos: Textos que se desean procesar.
+    :type textos: list, iterable
+    :param n_procesos: Número de procesos que se utilizan. Si es `None`, \
+        se utiliza el número de núcleos del equipo. Valor por defecto `1`.
+    :type n_procesos: int, opcional
+    :return: (list) Lista con los textos procesados, en el mismo orden de \
+        entrada.
+    """
+    textos = list(textos)
+    if n_procesos is None:
+        n_procesos = os.cpu_count()
+    if n_procesos <= 1 or len(textos) < MIN_TEXTOS_PARALELO:
+        return funcion(textos)
+    # Se hacen varios lotes por proceso, para repartir mejor la carga
+    # cuando los textos tienen longitudes distintas
+    n_lotes = n_procesos * 4
+    tam_lote = -(-len(textos) // n_lotes)
+    lotes = [
+        textos[i : i + tam_lote] for i in range(0, len(textos), tam_lote)
+    ]
+    with ProcessPoolExecutor(max_workers=n_procesos) as ejecutor:
+        resultados = ejecutor.map(funcion, lotes)
+        return [texto for lote in resultados for texto in lote]
+
+
+def _es_serie(texto):
+    """
+    Determina si la entrada es una serie de pandas, sin importar pandas \
+    cuando la entrada es un texto.
+
+    :param texto: Objeto de entrada.
+    :return: (bool) `True` si la entrada es de tipo `pandas.Series`.
+    """
+    if isinstance(texto, (str, list, tuple)):
+        return False
+    import pandas as pd
+
+    return isinstance(texto, pd.Series)
+
+
+def _limpieza_basica_lote(textos, quitar_numeros=True, ignorar_mayus=True):
+    """
+    Aplica la función `limpieza_basica` a cada texto de una lista.
+
+    :param textos: Lista de textos de entrada.
+    :type textos: list
+    :return: (list) Lista de textos después de la limpieza básica.
+    """
+    return [limpieza_basica(t, quitar_numeros, ignorar_mayus) for t in textos]
+
+
+def limpieza_basica(
+    texto, quitar_numeros=True, ignorar_mayus=True, n_procesos=1
+):
     """
     Limpieza básica del texto. Esta función realiza una limpieza básica del \
     texto de entrada, transforma todo el texto a letras minúsculas, quita \
@@ -105,8 +386,9 @@ def limpieza_basica(texto, quitar_numeros=True, ignorar_mayus=True):
     tabulaciones.
 
     :param texto: Texto de entrada al que se le aplicará la limpieza \
-        básica.
-    :type texto: str
+        básica. También puede ser una lista (o cualquier iterable) de \
+        textos, o una serie de pandas.
+    :type texto: str, list, pandas.Series
     :param quitar_numeros: Indica si desea quitar los números dentro del \
         texto. Valor por defecto `True`.
     :type quitar_numeros: bool, opcional
@@ -114,24 +396,35 @@ def limpieza_basica(texto, quitar_numeros=True, ignorar_mayus=True):
         a letras minúsculas, en caso contrario, deja el texto como el \
         original. Valor por defecto `True`.
     :type ignorar_mayus: bool, opcional
-    :return: (str) Texto después de la limpieza básica.
+    :param n_procesos: Número de procesos que se utilizan cuando se \
+        ingresan varios textos. Si es `None`, se utiliza el número de \
+        núcleos del equipo. Si hay menos de `MIN_TEXTOS_PARALELO` textos, \
+        siempre se procesan en el proceso actual. Valor por defecto `1`.
+    :type n_procesos: int, opcional
+    :return: (str, list o pandas.Series) Texto después de la limpieza \
+        básica. Si se ingresaron varios textos, se devuelve una lista con \
+        los textos limpios, o una serie de pandas con el mismo índice si \
+        la entrada era una serie.
     """
-    # Texto a minúsculas
-    if ignorar_mayus:
-        texto = texto.lower()
-    # Pone un espacio antes y después de cada signo de puntuación
-    texto = re.sub(r"([\.\",\(\)!\?;:])", " \\1 ", texto)
-    # Quita caracteres especiales del texto.
-    # RegEx adaptada de https://stackoverflow.com/a/56280214
-    if quitar_numeros:
-        texto = re.sub(r"[^ a-zA-ZÀ-ÖØ-öø-ÿ]+", " ", texto)
-    else:
-        texto = re.sub(r"[^ a-zA-ZÀ-ÖØ-öø-ÿ0-9]+", " ", texto)
-    # Reemplaza espacios múltiples por un solo espacio
-    texto = re.sub(r" +", " ", texto)
-    # Quitar espacios, tabs y enters en los extremos del texto
-    texto = texto.strip(" \t\n\r")
-    return texto
+    if not isinstance(texto, str):
+        salida = procesar_lote(
+            partial(
+                _limpieza_basica_lote,
+                quitar_numeros=quitar_numeros,
+                ignorar_mayus=ignorar_mayus,
+            ),
+            texto,
+            n_procesos,
+        )
+        if _es_serie(texto):
+            return type(texto)(salida, index=texto.index, name=texto.name)
+        return salida
+    # En una sola pasada se pasa el texto a minúsculas y se reemplazan los
+    # signos de puntuación y caracteres especiales por espacios. Luego se
+    # reemplazan los espacios múltiples por uno solo y se quitan los
+    # espacios de los extremos del texto
+    tabla = tabla_normalizacion(quitar_numeros, ignorar_mayus)
+    return " ".join(texto.translate(tabla).split())
 
 
 def limpieza_texto(
@@ -145,6 +438,8 @@ def limpieza_texto(
     ignorar_mayus=True,
     tokenizador=None,
     momento_stopwords="ambos",
+    limites_palabra=False,
+    n_procesos=1,
 ):
     """
     Limpieza completa de texto. Esta función hace una limpieza exhaustiva del \
@@ -152,8 +447,10 @@ def limpieza_texto(
     `lista_palabras` y `lista_expresiones`, quita acentos de las palabras, \
     números y palabras de longitud menor a `n_min`.
 
-    :param texto: Texto de entrada al que se le aplicará la limpieza.
-    :type texto: str
+    :param texto: Texto de entrada al que se le aplicará la limpieza. \
+        También puede ser una lista (o cualquier iterable) de textos, o una \
+        serie de pandas.
+    :type texto: str, list, pandas.Series
     :param lista_palabras: Lista de palabras que se desean quitar del texto. \
         Por ejemplo, la lista `['hola', 'de', 'a']` eliminará esas palabras.
     :type lista_palabras: list, opcional
@@ -193,40 +490,211 @@ def limpieza_texto(
         `stopwords` de los textos en ambos instantes al asignar el valor \
         `momento_stopwords = 'ambos'`. Valor por defecto `ambos`.
     :type momento_stopwords: {'antes', 'después', 'ambos'}, opcional
-    :return: (str) Texto después de la limpieza completa.
-    """
-    # Estandarizar parámetro de momento_stopwords
-    momento_stopwords = remover_acentos(momento_stopwords).lower()
-    # Quitar palabras y expresiones no deseadas. Se hace al texto original
-    # porque la palabra/expresión a remover puede tener tildes/mayúsculas
-    # /signos o estar compuesta por palabras cortas
-    if momento_stopwords in ("antes", "ambos"):
-        texto = remover_stopwords(
-            texto,
-            lista_palabras,
-            lista_expresiones,
-            ubicacion_archivo,
-            tokenizador,
+    :param limites_palabra: Si es `True`, solo se quitan las expresiones \
+        de `lista_expresiones` que aparecen completas, es decir, que no \
+        están precedidas ni seguidas por una letra o número. Valor por \
+        defecto `False`.
+    :type limites_palabra: bool, opcional
+    :param n_procesos: Número de procesos que se utilizan cuando se \
+        ingresan varios textos. Si es `None`, se utiliza el número de \
+        núcleos del equipo. Si hay menos de `MIN_TEXTOS_PARALELO` textos, \
+        siempre se procesan en el proceso actual. Valor por defecto `1`.
+    :type n_procesos: int, opcional
+    :return: (str, list o pandas.Series) Texto después de la limpieza \
+        completa. Si se ingresaron varios textos, se devuelve una lista con \
+        los textos limpios, o una serie de pandas con el mismo índice si \
+        la entrada era una serie.
+    """
+    limpiador = LimpiadorTexto(
+        lista_palabras,
+        lista_expresiones,
+        ubicacion_archivo,
+        n_min,
+        quitar_numeros,
+        quitar_acentos,
+        ignorar_mayus,
+        tokenizador,
+        momento_stopwords,
+        limites_palabra,
+    )
+    if isinstance(texto, str):
+        return limpiador.limpiar(texto)
+    return limpiador.limpiar_lote(texto, n_procesos)
+
+
+class LimpiadorTexto:
+    def __init__(
+        self,
+        lista_palabras=[],
+        lista_expresiones=[],
+        ubicacion_archivo=None,
+        n_min=0,
+        quitar_numeros=True,
+        quitar_acentos=False,
+        ignorar_mayus=True,
+        tokenizador=None,
+        momento_stopwords="ambos",
+        limites_palabra=False,
+    ):
+        """
+        Constructor por defecto de la clase `LimpiadorTexto`. Esta clase \
+        aplica la misma limpieza que la función `limpieza_texto`, pero \
+        prepara una sola vez todo lo que necesita (listas de palabras, \
+        expresiones, tokenizador y expresiones regulares), por lo que es \
+        más eficiente para limpiar muchos textos con la misma \
+        configuración.
+
+        :param lista_palabras: Lista de palabras que se desean quitar del \
+            texto. Por ejemplo, la lista `['hola', 'de', 'a']` eliminará \
+            esas palabras.
+        :type lista_palabras: list, opcional
+        :param lista_expresiones: Lista de expresiones que se quieren quitar \
+            al texto. A diferencia de `lista_palabras`, esta puede contener \
+            palabras compuestas. Por ejemplo, \
+            `['San juan de Dios', 'Distrito Capital, 'fuente de agua']`; \
+            esta lista quitará esas palabras compuestas del texto de entrada.
+        :type lista_expresiones: list, opcional
+        :param ubicacion_archivo: Ruta del archivo plano que contiene la \
+            lista de palabras y/o lista de palabras separadas por espacios, \
+            comas o saltos de línea. El archivo se lee una sola vez, al \
+            crear el objeto. En caso contrario no es necesario especificar \
+            los parametros `lista_palabras` y `lista_expresiones`. \
+            Valor por defecto: None.
+        :type ubicacion_archivo: str, opcional
+        :param n_min: Longitud mínima de las palabras aceptadas en el texto \
+             de entrada. Valor por defecto `0`.
+        :type n_min: int, opcional
+        :param quitar_numeros: Indica si desea quitar los números dentro del \
+            texto. Valor por defecto `True`.
+        :type quitar_numeros: bool, opcional
+        :param quitar_acentos: Opción para determinar si se quitan acentos \
+            (tildes, diéresis, virgulilla) del texto. Valor por defecto \
+            `False`.
+        :type quitar_acentos: bool, opcional
+        :param ignorar_mayus: Si `ignorar_mayus = True`, convierte el texto \
+            todo a letras minúsculas, en caso contrario, deja el texto como \
+            el original. Valor por defecto `True`.
+        :type ignorar_mayus: bool, opcional
+        :param tokenizador: Objeto encargado de la tokenización y \
+            detokenización de textos. Si el valor es 'None', se utilizará \
+            por defecto una instancia de la clase `TokenizadorNLTK`.
+        :type tokenizador: Tokenizer, opcional
+        :param momento_stopwords: Indica en que parte del proceso de \
+            limpieza de texto se remueven las `stopwords`. Para mayor \
+            información, consultar la función `limpieza_texto`. Valor por \
+            defecto `ambos`.
+        :type momento_stopwords: {'antes', 'después', 'ambos'}, opcional
+        :param limites_palabra: Si es `True`, solo se quitan las \
+            expresiones de `lista_expresiones` que aparecen completas, es \
+            decir, que no están precedidas ni seguidas por una letra o \
+            número. Valor por defecto `False`.
+        :type limites_palabra: bool, opcional
+        """
+        if ubicacion_archivo is not None:
+            lista_palabras, lista_expresiones = cargar_stopwords(
+                ubicacion_archivo
+            )
+        self.palabras = frozenset(lista_palabras)
+        self.patron_expresiones = compilar_expresiones(
+            lista_expresiones, limites_palabra
         )
-    # Se verifica si se desean quitar acentos/tildes
-    if quitar_acentos:
-        texto = remover_acentos(texto)
-    # Limpieza básica del texto
-    texto = limpieza_basica(texto, quitar_numeros, ignorar_mayus)
-    # Quita palabras cortas y palabras pertenecientes a una lista específica
-    texto = remover_palabras_cortas(texto, n_min)
-    # Se quitan stopwords de nuevo, por si habían palabras que después de
-    # su limpieza quedan en
-    # la lista de palabras/expresiones no deseadas
-    if momento_stopwords in ("despues", "ambos"):
-        texto = remover_stopwords(
-            texto,
-            lista_palabras,
-            lista_expresiones,
-            ubicacion_archivo,
-            tokenizador,
+        self.n_min = n_min
+        self.quitar_numeros = quitar_numeros
+        self.quitar_acentos = quitar_acentos
+        self.ignorar_mayus = ignorar_mayus
+        self.tabla = tabla_normalizacion(
+            quitar_numeros, ignorar_mayus, quitar_acentos
         )
-    return texto
+        if tokenizador is None:
+            tokenizador = tokenizador_defecto()
+        self.tokenizador = tokenizador
+        # Estandarizar parámetro de momento_stopwords
+        momento_stopwords = remover_acentos(momento_stopwords).lower()
+        self.stopwords_antes = momento_stopwords in ("antes", "ambos")
+        self.stopwords_despues = momento_stopwords in ("despues", "ambos")
+
+    def remover_stopwords(self, texto):
+        """
+        Quita del texto las palabras y expresiones definidas al crear el \
+        objeto.
+
+        :param texto: Texto de entrada.
+        :type texto: str
+        :return: (str) Texto sin las palabras y expresiones no deseadas.
+        """
+        # Quitar las expresiones no deseadas, todas en una sola pasada
+        if self.patron_expresiones is not None:
+            texto = self.patron_expresiones.sub(" ", texto)
+        # Dejar solo las palabras que no aparecen en la lista de palabras no
+        # deseadas
+        palabras = self.palabras
+        tokens = self.tokenizador.tokenizar(texto)
+        texto = self.tokenizador.destokenizar(
+            [p for p in tokens if p not in palabras]
+        )
+        # Reemplaza espacios múltiples por un solo espacio
+        return RE_ESPACIOS.sub(" ", texto)
+
+    def limpiar(self, texto):
+        """
+        Aplica la limpieza completa a un texto, con la configuración \
+        definida al crear el objeto.
+
+        :param texto: Texto de entrada al que se le aplicará la limpieza.
+        :type texto: str
+        :return: (str) Texto después de la limpieza completa.
+        """
+        # Quitar palabras y expresiones no deseadas. Se hace al texto
+        # original porque la palabra/expresión a remover puede tener
+        # tildes/mayúsculas/signos o estar compuesta por palabras cortas
+        if self.stopwords_antes:
+            texto = self.remover_stopwords(texto)
+        # Limpieza básica del texto, quitando los acentos si se desea, en
+        # una sola pasada
+        texto = " ".join(texto.translate(self.tabla).split())
+        # Quita palabras cortas
+        if self.n_min > 0:
+            texto = remover_palabras_cortas(texto, self.n_min)
+        # Se quitan stopwords de nuevo, por si habían palabras que después de
+        # su limpieza quedan en la lista de palabras/expresiones no deseadas
+        if self.stopwords_despues:
+            texto = self.remover_stopwords(texto)
+        return texto
+
+    def _limpiar_textos(self, textos):
+        """
+        Aplica la limpieza completa a una lista de textos, en el proceso \
+        actual.
+
+        :param textos: Lista de textos de entrada.
+        :type textos: list
+        :return: (list) Lista con los textos después de la limpieza.
+        """
+        limpiar = self.limpiar
+        return [limpiar(texto) for texto in textos]
+
+    def limpiar_lote(self, textos, n_procesos=1):
+        """
+        Aplica la limpieza completa a varios textos, con la configuración \
+        definida al crear el objeto.
+
+        :param textos: Textos de entrada a los que se les aplicará la \
+            limpieza.
+        :type textos: list, iterable, pandas.Series
+        :param n_procesos: Número de procesos entre los que se reparten los \
+            textos. Si es `None`, se utiliza el número de núcleos del \
+            equipo. Si hay menos de `MIN_TEXTOS_PARALELO` textos, siempre se \
+            procesan en el proceso actual. Valor por defecto `1`.
+        :type n_procesos: int, opcional
+        :return: (list o pandas.Series) Lista con los textos después de la \
+            limpieza completa, en el mismo orden de entrada. Si la entrada \
+            es una serie de pandas, se devuelve una serie con el mismo \
+            índice.
+        """
+        salida = procesar_lote(self._limpiar_textos, textos, n_procesos)
+        if _es_serie(textos):
+            return type(textos)(salida, index=textos.index, name=textos.name)
+        return salida
 
 
 def limpiar_extremos(texto):
@@ -302,11 +770,84 @@ def cargar_stopwords(ubicacion_archivo, encoding="utf8"):
     return lista_palabras, lista_expresiones
 
 
+@lru_cache(maxsize=None)
+def _cargar_lista(nombre_archivo, encoding="utf8"):
+    """
+    Carga una de las listas de palabras y expresiones que vienen con la \
+    librería. El resultado se guarda en memoria, por lo que cada archivo \
+    se lee una sola vez.
+
+    :param nombre_archivo: Nombre del archivo, dentro de la carpeta \
+        `data/listas_stopwords`.
+    :type nombre_archivo: str
+    :param encoding: Codificación del archivo de texto. Valor por defecto \
+        `'utf-8'`.
+    :type encoding: str, opcional
+    :return: (tuple) Tupla con las palabras y las expresiones de la lista, \
+        cada una como una tupla.
+    """
+    ruta = os.path.join(DIR_LISTAS, nombre_archivo)
+    palabras, expresiones = cargar_stopwords(ruta, encoding)
+    return tuple(palabras), tuple(expresiones)
+
+
+@lru_cache(maxsize=None)
+def _unir_listas(*nombres_archivos):
+    """
+    Une varias de las listas que vienen con la librería, sin elementos \
+    repetidos y en orden alfabético. El resultado se guarda en memoria.
+
+    :param nombres_archivos: Nombres de los archivos que se desean unir.
+    :type nombres_archivos: str
+    :return: (tuple) Tupla con las palabras y las expresiones de las \
+        listas, cada una como una tupla.
+    """
+    listas = [_cargar_lista(nombre) for nombre in nombres_archivos]
+    palabras = sorted(set(p for lista in listas for p in lista[0]))
+    expresiones = sorted(set(e for lista in listas for e in lista[1]))
+    return tuple(palabras), tuple(expresiones)
+
+
+@lru_cache(maxsize=None)
+def _stopwords(lenguaje):
+    """
+    Obtiene las stopwords de un idioma, como una tupla. El resultado se \
+    guarda en memoria, por lo que cada lista se carga una sola vez.
+
+    :param lenguaje: Nombre del idioma, como lo utiliza NLTK.
+    :type lenguaje: str
+    :return: (tuple) Tupla de palabras stopwords del idioma.
+    """
+    sw = None
+    # Si se quieren en español, se intenta sacar las stopwords
+    # desde la lista predfinida que viene con la librería
+    if lenguaje == "spanish":
+        try:
+            sw = list(_cargar_lista("sw_es.txt", "latin-1")[0])
+        except BaseException:
+            pass
+    # Si no, se cargan las stopwords de NLTK
+    if sw is None:
+        from nltk.corpus import stopwords
+
+        try:
+            sw = stopwords.words(lenguaje)
+        except Exception:
+            import nltk
+
+            nltk.download("stopwords")
+            sw = stopwords.words(lenguaje)
+    # Quitar elemento vacío de la lista, si está
+    return tuple(i for i in sw if i != "")
+
+
 def lista_stopwords(lenguaje="es"):
     """
     Genera una lista de stopwords (palabras que se quieren quitar de un \
     texto). Función que genera una lista de stopwords de un idioma \
-    predeterminado.
+    predeterminado. Las listas se cargan una sola vez y se mantienen en \
+    memoria, por lo que llamar varias veces esta función no tiene costo \
+    adicional.
 
     :param lenguaje: Define el lenguaje para la generación de las \
         stopwords. Para mayor información, consultar la sección de \
@@ -318,31 +859,8 @@ def lista_stopwords(lenguaje="es"):
     from lenguajes import definir_lenguaje
 
     lenguaje = definir_lenguaje(lenguaje, False)
-
-    from nltk.corpus import stopwords
-
-    try:
-        sw = stopwords.words(lenguaje)
-    except Exception:
-        import nltk
-
-        nltk.download("stopwords")
-        sw = stopwords.words(lenguaje)
-    # Si se quieren en español, se intenta sacar las stopwords
-    # desde la lista predfinida que viene con la librería
-    if lenguaje == "spanish":
-        try:
-            ruta = pkg_resources.resource_filename(
-                __name__, "data/listas_stopwords/sw_es.txt"
-            )
-            sw = cargar_stopwords(ruta, "latin-1")[0]
-        except BaseException:
-            pass
-    # Quitar elemento vacío de la lista, si está
-    if "" in sw:
-        sw.remove("")
-    # Devolver stopwords
-    return sw
+    # Se devuelve una copia, para que la lista en memoria no sea modificada
+    return list(_stopwords(lenguaje))
 
 
 def lista_nombres(tipo="todos"):
@@ -359,27 +877,13 @@ def lista_nombres(tipo="todos"):
     :return: (list) Lista de nombres en español.
     """
     if tipo.lower() in ["m", "masculino", "hombre", "hombres"]:
-        ruta = pkg_resources.resource_filename(
-            __name__, "data/listas_stopwords/nombres_hombres.txt"
-        )
-        return cargar_stopwords(ruta)
+        listas = _cargar_lista("nombres_hombres.txt")
     elif tipo.lower() in ["f", "femenino", "mujer", "mujeres"]:
-        ruta = pkg_resources.resource_filename(
-            __name__, "data/listas_stopwords/nombres_mujeres.txt"
-        )
-        return cargar_stopwords(ruta)
+        listas = _cargar_lista("nombres_mujeres.txt")
     elif tipo == "todos":
-        ruta = pkg_resources.resource_filename(
-            __name__, "data/listas_stopwords/nombres_ambos.txt"
+        listas = _unir_listas(
+            "nombres_ambos.txt", "nombres_hombres.txt", "nombres_mujeres.txt"
         )
-        lista_todos = list(cargar_stopwords(ruta))
-        lista_hombres = lista_nombres("hombre")
-        lista_mujeres = lista_nombres("mujer")
-        for i in range(2):
-            lista_todos[i] += lista_hombres[i] + lista_mujeres[i]
-            lista_todos[i] = sorted(list(set(lista_todos[i])))
-
-        return lista_todos[0], lista_todos[1]
     else:
         print(
             (
@@ -388,6 +892,8 @@ def lista_nombres(tipo="todos"):
             )
         )
         return [], []
+    # Se devuelven copias, para que las listas en memoria no sean modificadas
+    return list(listas[0]), list(listas[1])
 
 
 def lista_apellidos():
@@ -396,10 +902,8 @@ def lista_apellidos():
 
     :return: (list) Lista de apellidos más comunes del español.
     """
-    ruta = pkg_resources.resource_filename(
-        __name__, "data/listas_stopwords/apellidos.txt"
-    )
-    return cargar_stopwords(ruta)
+    listas = _cargar_lista("apellidos.txt")
+    return list(listas[0]), list(listas[1])
 
 
 def lista_geo_colombia(tipo="todos"):
@@ -413,34 +917,12 @@ def lista_geo_colombia(tipo="todos"):
     :type tipo: {'todos', 'municipios', 'departamentos'}, opcional
     :return: (list) Lista de nombres de municipios, departamentos o ambos.
     """
-    ruta_mun = pkg_resources.resource_filename(
-        __name__, "data/listas_stopwords/municipios_col.txt"
-    )
-    ruta_dep = pkg_resources.resource_filename(
-        __name__, "data/listas_stopwords/departamentos_col.txt"
-    )
     if tipo == "todos":
-        palabras = sorted(
-            list(
-                set(
-                    cargar_stopwords(ruta_mun)[0]
-                    + cargar_stopwords(ruta_dep)[0]
-                )
-            )
-        )
-        expresiones = sorted(
-            list(
-                set(
-                    cargar_stopwords(ruta_mun)[1]
-                    + cargar_stopwords(ruta_dep)[1]
-                )
-            )
-        )
-        return palabras, expresiones
+        listas = _unir_listas("municipios_col.txt", "departamentos_col.txt")
     elif tipo.lower() in ["municipios", "mun", "m"]:
-        return cargar_stopwords(ruta_mun)
+        listas = _cargar_lista("municipios_col.txt")
     elif tipo.lower() in ["departamentos", "dep", "d"]:
-        return cargar_stopwords(ruta_dep)
+        listas = _cargar_lista("departamentos_col.txt")
     else:
         print(
             (
@@ -449,3 +931,4 @@ def lista_geo_colombia(tipo="todos"):
             )
         )
         return [], []
+    return list(listas[0]), list(listas[1])
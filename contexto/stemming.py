@@ -1,7 +1,7 @@
 import nltk.stem
 from limpieza import limpieza_basica
 from lenguajes import detectar_lenguaje, definir_lenguaje
-from utils.tokenizacion import TokenizadorNLTK
+from utils.tokenizacion import tokenizador_defecto
 
 # Definir clase para el stemmer ###
 
@@ -30,7 +30,7 @@ class Stemmer:
         self.iniciar_stemmer()
         # Para tokenizar los textos antes de aplicar el stemming
         self.tokenizador = (
-            TokenizadorNLTK() if tokenizador is None else tokenizador
+            tokenizador_defecto() if tokenizador is None else tokenizador
         )
 
     def establecer_lenguaje(self, lenguaje):
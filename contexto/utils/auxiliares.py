@@ -497,22 +497,43 @@ def doc_a_pdf_linux(archivo_entrada, archivo_salida):
     :param archivo_salida: (str). Ubicación en donde se desea guardar el \
         archivo PDF generado.
     """
+    import shutil
     import subprocess
+    import tempfile
 
     # Para que no haya problema con paths relativos
     archivo_entrada = os.path.realpath(archivo_entrada)
     archivo_salida = os.path.realpath(archivo_salida)
 
-    cmd = "libreoffice --convert-to pdf".split() + [archivo_entrada]
-    p = subprocess.Popen(cmd, stderr=subprocess.PIPE, stdout=subprocess.PIPE)
-    p.wait(timeout=10)
-    stdout, stderr = p.communicate()
-    out = str(stdout).split(" -> ")[1].split(" using")[0]
-    if stderr:
-        raise subprocess.SubprocessError(stderr)
-
-    p.stdout.close()
-    os.rename(out, archivo_salida)
+    # Cada conversión usa su propia carpeta de salida y su propio perfil de
+    # LibreOffice, para que varias conversiones puedan correr al mismo tiempo
+    with tempfile.TemporaryDirectory(prefix="contexto_") as carpeta:
+        perfil = "file://" + os.path.join(carpeta, "perfil")
+        cmd = [
+            "libreoffice",
+            f"-env:UserInstallation={perfil}",
+            "--headless",
+            "--convert-to",
+            "pdf",
+            "--outdir",
+            carpeta,
+            archivo_entrada,
+        ]
+        p = subprocess.Popen(
+            cmd, stderr=subprocess.PIPE, stdout=subprocess.PIPE
+        )
+        try:
+            stdout, stderr = p.communicate(timeout=60)
+        except subprocess.TimeoutExpired:
+            # Se termina LibreOffice antes de borrar la carpeta de su perfil
+            p.kill()
+            p.communicate()
+            raise
+        nombre = os.path.splitext(os.path.basename(archivo_entrada))[0]
+        out = os.path.join(carpeta, f"{nombre}.pdf")
+        if not os.path.exists(out):
+            raise subprocess.SubprocessError(stderr)
+        shutil.move(out, archivo_salida)
 
 
 def word_a_pdf(archivo_entrada, archivo_salida=None):
@@ -526,73 +547,100 @@ def word_a_pdf(archivo_entrada, archivo_salida=None):
     :param archivo_salida: (str). Valor por defecto: None. Ubicación en \
         donde se desea guardar el archivo PDF generado. Si no se asigna \
         un valor a este argumento, la función guardará el archivo PDF \
-        generado en una ubicación generada automáticamente.
+        generado en un archivo temporal con nombre único, dentro de la \
+        carpeta temporal del sistema (que puede definirse con la variable \
+        de entorno TMPDIR). En ese caso, quien llama la función debe \
+        borrar el archivo cuando ya no lo necesite.
     :return: (str). Ubicación en la que quedó guardado el archivo PDF.
     """
     import sys
+    import tempfile
 
-    if archivo_salida is None:
-        archivo_salida = f"temp_pdf_{os.getpid()}.pdf"
-    # Realizar la conversión
-    if sys.platform == "win32":
-        doc_a_pdf(archivo_entrada, archivo_salida)
-        return archivo_salida
-    elif sys.platform == "linux":
-        try:
-            doc_a_pdf_linux(archivo_entrada, archivo_salida)
-            return archivo_salida
-        except Exception:
-            raise RuntimeError(
-                "Para poder procesar archivos 'doc' o 'docx' en Linux, se "
-                "debe tener instalado LibreOffice. Por favor instale "
-                "libreoffice:\n"
-                "\t $ sudo add-apt-repository ppa:libreoffice/ppa\n"
-                "\t $ sudo apt-get update\n"
-                "\t $ sudo apt-get install libreoffice\n"
-            )
-    else:
+    if sys.platform not in ["win32", "linux"]:
         raise NotImplementedError(
             "La lectura de documentos tipo '.doc' o 'docx' "
             "no está disponible para este Sistema Operativo"
         )
+    archivo_temporal = archivo_salida is None
+    if archivo_temporal:
+        # Archivo con nombre único, para que varios hilos o procesos puedan
+        # convertir documentos al mismo tiempo
+        descriptor, archivo_salida = tempfile.mkstemp(
+            suffix=".pdf", prefix="contexto_"
+        )
+        os.close(descriptor)
+    # Realizar la conversión
+    try:
+        if sys.platform == "win32":
+            doc_a_pdf(archivo_entrada, archivo_salida)
+        else:
+            doc_a_pdf_linux(archivo_entrada, archivo_salida)
+        return archivo_salida
+    except Exception as e:
+        # No se deja el archivo temporal si la conversión falla
+        if archivo_temporal and os.path.exists(archivo_salida):
+            os.remove(archivo_salida)
+        if sys.platform == "win32":
+            raise e
+        raise RuntimeError(
+            "Para poder procesar archivos 'doc' o 'docx' en Linux, se "
+            "debe tener instalado LibreOffice. Por favor instale "
+            "libreoffice:\n"
+            "\t $ sudo add-apt-repository ppa:libreoffice/ppa\n"
+            "\t $ sudo apt-get update\n"
+            "\t $ sudo apt-get install libreoffice\n"
+        )
 
 
 # Funciones para leer archivos PDF ---
-def leer_pdf_pypdf(ubicacion_archivo, password=None):
+
+# Signos de puntuación que se consideran válidos en el texto de una página
+PUNTUACION_COMUN = set(".,;:¿?¡!()[]{}\"'«»“”‘’-–—_/\\%$#&*+=<>°ºª@|")
+
+
+def iterar_pdf_pypdf(ubicacion_archivo, password=None):
     """
     Utiliza la librería PyPDF2 para cargar un archivo PDF y extraer el \
-    texto de sus páginas.
+    texto de sus páginas, una a la vez. A diferencia de `leer_pdf_pypdf`, \
+    el texto de cada página se extrae solo cuando se solicita.
 
     :param ubicacion_archivo: (str). Ubicación del archivo PDF que se \
         desea leer.
     :param password: (str). Valor por defecto: None. Parámetro opcional \
         para leer archivos PDF que están protegidos por contraseña.
-    :return: (list). Lista de strings, que contienen el texto extraído \
-        de cada página del PDF.
+    :return: (generator). Generador que entrega el texto extraído de cada \
+        página del PDF, en orden.
     """
     import PyPDF2
 
-    # Función interna para manejar errores de lectura de página
-
-    def leer_pag(lector, pag, ubicacion_archivo):
-        try:
-            with open(ubicacion_archivo, "rb") as _:
-                return lector.getPage(pag).extractText()
-        except BaseException:
-            return ""
-
     # Crear objeto del lector, con el archivo PDF
     with open(ubicacion_archivo, "rb") as archivo_pdf:
         lector = PyPDF2.PdfFileReader(archivo_pdf, strict=False)
         if password is not None:
             lector.decrypt(password)
-        # Leer y extraer contenido de las páginas del archivo
-        num_paginas = lector.getNumPages()
-        paginas = [
-            leer_pag(lector, i, ubicacion_archivo) for i in range(num_paginas)
-        ]
-    # Retornar textos extraídos
-    return paginas
+        # Leer y extraer contenido de las páginas del archivo. Si hay un
+        # error al leer una página, se devuelve un texto vacío
+        for pag in range(lector.getNumPages()):
+            try:
+                texto = lector.getPage(pag).extractText()
+            except BaseException:
+                texto = ""
+            yield texto
+
+
+def leer_pdf_pypdf(ubicacion_archivo, password=None):
+    """
+    Utiliza la librería PyPDF2 para cargar un archivo PDF y extraer el \
+    texto de sus páginas.
+
+    :param ubicacion_archivo: (str). Ubicación del archivo PDF que se \
+        desea leer.
+    :param password: (str). Valor por defecto: None. Parámetro opcional \
+        para leer archivos PDF que están protegidos por contraseña.
+    :return: (list). Lista de strings, que contienen el texto extraído \
+        de cada página del PDF.
+    """
+    return list(iterar_pdf_pypdf(ubicacion_archivo, password))
 
 
 def leer_pdf_slate(ubicacion_archivo, password=None):
@@ -624,6 +672,36 @@ def leer_pdf_slate(ubicacion_archivo, password=None):
     return paginas
 
 
+def texto_pagina_valido(texto, min_caracteres=20, prop_validos=0.8):
+    """
+    Determina si el texto extraído de la capa de texto de una página de \
+    un PDF es utilizable, o si es mejor aplicar OCR sobre la página. Un \
+    texto se considera utilizable si tiene por lo menos un número mínimo \
+    de caracteres y si la mayoría de estos son letras, números o signos \
+    de puntuación comunes.
+
+    :param texto: (str). Texto extraído de la página.
+    :param min_caracteres: (int). Valor por defecto: 20. Número mínimo de \
+        caracteres (sin contar espacios) que debe tener el texto.
+    :param prop_validos: (float). Valor por defecto: 0.8. Proporción mínima \
+        de caracteres válidos (letras, números y signos de puntuación \
+        comunes) dentro del texto.
+    :return: (bool). True si el texto de la página es utilizable, False \
+        en caso contrario.
+    """
+    # Los glifos que no se pudieron decodificar aparecen como '(cid:123)'
+    # o como el carácter de reemplazo
+    texto = "".join(texto.split())
+    n_total = len(texto)
+    texto = re.sub(r"\(cid:\d+\)|\ufffd", "", texto)
+    if n_total < min_caracteres:
+        return False
+    n_validos = sum(
+        1 for c in texto if c.isalnum() or c in PUNTUACION_COMUN
+    )
+    return n_validos >= prop_validos * n_total
+
+
 # Funciones para guardar y cargar objetos en Python ---
 
 
@@ -0,0 +1,161 @@
+"""
+Caché en disco para el texto extraído de archivos con la clase `Lector`.
+
+Los resultados se guardan en una base de datos SQLite, identificados por el
+contenido del archivo (y no por su nombre o ubicación) y por los parámetros
+de extracción. De esta forma, volver a leer un archivo que no ha cambiado,
+con los mismos parámetros, no requiere volver a procesarlo.
+"""
+import hashlib
+import json
+import os
+import sqlite3
+import time
+import zlib
+from auxiliares import verificar_crear_dir
+
+
+class CacheExtraccion:
+    def __init__(self, ubicacion="cache_contexto/", tam_max=1024):
+        """
+        Constructor por defecto de la clase `CacheExtraccion`. Esta clase \
+        guarda en disco el texto extraído de archivos, de forma comprimida, \
+        para que pueda ser reutilizado. Puede ser utilizada al mismo tiempo \
+        por varios hilos o procesos. Cuando el tamaño de la caché supera el \
+        máximo establecido, se eliminan los resultados que llevan más \
+        tiempo sin ser consultados.
+
+        :param ubicacion: Ruta de la carpeta donde se guarda la caché. \
+            Valor por defecto `'cache_contexto/'`.
+        :type ubicacion: str, opcional
+        :param tam_max: Tamaño máximo de la caché, en megabytes. Valor por \
+            defecto `1024`.
+        :type tam_max: float, opcional
+        """
+        verificar_crear_dir(ubicacion)
+        self.ubicacion = ubicacion
+        self.archivo_db = os.path.join(ubicacion, "extracciones.sqlite3")
+        self.tam_max = int(tam_max * 1024 ** 2)
+        with self._conectar() as conexion:
+            # El modo WAL permite lecturas mientras otro proceso escribe
+            conexion.execute("PRAGMA journal_mode=WAL")
+            conexion.execute(
+                "CREATE TABLE IF NOT EXISTS extracciones ("
+                "llave TEXT PRIMARY KEY, datos BLOB, tam INTEGER, "
+                "ultimo_acceso REAL)"
+            )
+            conexion.execute(
+                "CREATE INDEX IF NOT EXISTS idx_acceso "
+                "ON extracciones (ultimo_acceso)"
+            )
+        conexion.close()
+
+    def _conectar(self):
+        """
+        Abre una conexión nueva a la base de datos de la caché. Se abre una \
+        conexión por operación para que el objeto pueda compartirse entre \
+        hilos y procesos.
+
+        :return: (sqlite3.Connection) Conexión a la base de datos.
+        """
+        return sqlite3.connect(self.archivo_db, timeout=60)
+
+    def llave(self, ubicacion_archivo, parametros):
+        """
+        Calcula la llave con la que se identifica el resultado de extraer \
+        el texto de un archivo con unos parámetros determinados.
+
+        :param ubicacion_archivo: Ruta del archivo.
+        :type ubicacion_archivo: str
+        :param parametros: Parámetros de la extracción.
+        :type parametros: dict
+        :return: (str) Llave del resultado, compuesta por el *hash* del \
+            contenido del archivo y el *hash* de los parámetros.
+        """
+        hash_archivo = hashlib.blake2b(digest_size=20)
+        with open(ubicacion_archivo, "rb") as fp:
+            for bloque in iter(lambda: fp.read(1024 ** 2), b""):
+                hash_archivo.update(bloque)
+        texto_parametros = json.dumps(parametros, sort_keys=True)
+        hash_parametros = hashlib.blake2b(
+            texto_parametros.encode("utf-8"), digest_size=8
+        )
+        return f"{hash_archivo.hexdigest()}_{hash_parametros.hexdigest()}"
+
+    def obtener(self, llave):
+        """
+        Busca en la caché el resultado asociado a una llave.
+
+        :param llave: Llave del resultado, obtenida con el método `llave`.
+        :type llave: str
+        :return: (str, list) Texto guardado para esa llave, o `None` si no \
+            está en la caché.
+        """
+        with self._conectar() as conexion:
+            fila = conexion.execute(
+                "SELECT datos FROM extracciones WHERE llave = ?", (llave,)
+            ).fetchone()
+            if fila is not None:
+                conexion.execute(
+                    "UPDATE extracciones SET ultimo_acceso = ? "
+                    "WHERE llave = ?",
+                    (time.time(), llave),
+                )
+        conexion.close()
+        if fila is None:
+            return None
+        return json.loads(zlib.decompress(fila[0]).decode("utf-8"))
+
+    def guardar(self, llave, texto):
+        """
+        Guarda en la caché el texto asociado a una llave. Si con esto la \
+        caché supera su tamaño máximo, se eliminan los resultados que \
+        llevan más tiempo sin ser consultados.
+
+        :param llave: Llave del resultado, obtenida con el método `llave`.
+        :type llave: str
+        :param texto: Texto, o lista de textos, que se desea guardar.
+        :type texto: str, list
+        """
+        datos = zlib.compress(json.dumps(texto).encode("utf-8"))
+        with self._conectar() as conexion:
+            conexion.execute(
+                "INSERT OR REPLACE INTO extracciones VALUES (?, ?, ?, ?)",
+                (llave, datos, len(datos), time.time()),
+            )
+            self._liberar_espacio(conexion)
+        conexion.close()
+
+    def _liberar_espacio(self, conexion):
+        """
+        Elimina los resultados menos usados recientemente hasta que el \
+        tamaño de la caché sea menor o igual al máximo permitido.
+
+        :param conexion: Conexión abierta a la base de datos.
+        :type conexion: sqlite3.Connection
+        """
+        tam_total = conexion.execute(
+            "SELECT COALESCE(SUM(tam), 0) FROM extracciones"
+        ).fetchone()[0]
+        if tam_total <= self.tam_max:
+            return
+        filas = conexion.execute(
+            "SELECT llave, tam FROM extracciones ORDER BY ultimo_acceso"
+        )
+        borrar = []
+        for llave, tam in filas:
+            if tam_total <= self.tam_max:
+                break
+            borrar.append((llave,))
+            tam_total -= tam
+        conexion.executemany(
+            "DELETE FROM extracciones WHERE llave = ?", borrar
+        )
+
+    def vaciar(self):
+        """
+        Elimina todos los resultados guardados en la caché.
+        """
+        with self._conectar() as conexion:
+            conexion.execute("DELETE FROM extracciones")
+        conexion.close()
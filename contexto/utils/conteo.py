@@ -0,0 +1,151 @@
+"""
+Conteo aproximado de los términos más frecuentes con memoria acotada.
+
+Se implementa el algoritmo *Space-Saving* (Metwally, Agrawal y El Abbadi,
+2005), que mantiene a lo sumo `capacidad` términos sin importar cuántos
+términos distintos se observen.
+"""
+import heapq
+from collections import Counter
+from collections.abc import Mapping
+from itertools import islice
+
+# Número de términos que se agrupan antes de agregarlos al contador. Limita
+# la memoria adicional que se usa al contar un iterable de términos
+TAM_LOTE = 2 ** 16
+
+
+class ContadorAproximado:
+    def __init__(self, capacidad=10000):
+        """
+        Constructor por defecto de la clase `ContadorAproximado`. Esta clase \
+        cuenta de forma aproximada las apariciones de términos (por ejemplo, \
+        n-gramas), guardando como máximo `capacidad` términos a la vez. \
+        Cuando llega un término nuevo y el contador está lleno, este \
+        reemplaza al término con menor conteo y hereda su conteo. \
+        Se garantiza que:
+
+        - Todo término que aparezca más de `n_total / capacidad` veces está \
+          en el contador.
+        - El conteo de cada término nunca es menor a su número real de \
+          apariciones, y lo supera como máximo en `n_total / capacidad` \
+          (el error máximo de cada término se puede consultar con el \
+          método `error`).
+
+        :param capacidad: Número máximo de términos que se guardan. Valor \
+            por defecto `10000`.
+        :type capacidad: int, opcional
+        """
+        self.capacidad = capacidad
+        self.n_total = 0
+        self.conteos = {}
+        self.errores = {}
+        # Montículo de (conteo, término) con un elemento por término. Los
+        # conteos del montículo pueden estar desactualizados (solo se
+        # corrigen cuando el elemento llega a la cima)
+        self._monticulo = []
+
+    def __len__(self):
+        return len(self.conteos)
+
+    def __contains__(self, termino):
+        return termino in self.conteos
+
+    def __getitem__(self, termino):
+        return self.conteos.get(termino, 0)
+
+    @property
+    def cota_error(self):
+        """
+        Error máximo del conteo de cualquier término, igual a \
+        `n_total / capacidad`.
+        """
+        return self.n_total / self.capacidad
+
+    def error(self, termino):
+        """
+        Devuelve el error máximo del conteo de un término, es decir, cuánto \
+        puede superar su conteo al número real de apariciones.
+
+        :param termino: Término que se desea consultar.
+        :type termino: str
+        :return: (int) Error máximo del conteo del término.
+        """
+        return self.errores.get(termino, 0)
+
+    def agregar(self, termino, cantidad=1):
+        """
+        Suma `cantidad` apariciones de un término al contador.
+
+        :param termino: Término que se desea contar.
+        :type termino: str
+        :param cantidad: Número de apariciones. Valor por defecto `1`.
+        :type cantidad: int, opcional
+        """
+        self.n_total += cantidad
+        conteos = self.conteos
+        if termino in conteos:
+            conteos[termino] += cantidad
+            return
+        if len(conteos) < self.capacidad:
+            conteos[termino] = cantidad
+            self.errores[termino] = 0
+            heapq.heappush(self._monticulo, (cantidad, termino))
+            return
+        # Buscar el término con menor conteo, actualizando los elementos
+        # desactualizados que aparezcan en la cima del montículo
+        monticulo = self._monticulo
+        while True:
+            conteo, minimo = monticulo[0]
+            actual = conteos[minimo]
+            if actual == conteo:
+                break
+            heapq.heapreplace(monticulo, (actual, minimo))
+        # El término nuevo reemplaza al mínimo y hereda su conteo como error
+        del conteos[minimo]
+        del self.errores[minimo]
+        conteos[termino] = conteo + cantidad
+        self.errores[termino] = conteo
+        heapq.heapreplace(monticulo, (conteo + cantidad, termino))
+
+    def actualizar(self, terminos):
+        """
+        Cuenta varios términos a la vez, de forma similar al método \
+        `update` de `collections.Counter`. Los términos de un iterable se \
+        procesan por lotes de `TAM_LOTE` términos.
+
+        :param terminos: Iterable de términos, o diccionario de términos y \
+            número de apariciones.
+        :type terminos: iterable, dict
+        """
+        agregar = self.agregar
+        if isinstance(terminos, Mapping):
+            for termino, cantidad in terminos.items():
+                agregar(termino, cantidad)
+            return
+        # Los términos se agrupan por lotes con un Counter, que cuenta mucho
+        # más rápido, y cada término distinto del lote se agrega una vez
+        iterador = iter(terminos)
+        while True:
+            lote = Counter(islice(iterador, TAM_LOTE))
+            if not lote:
+                break
+            for termino, cantidad in lote.items():
+                agregar(termino, cantidad)
+
+    def most_common(self, n=None):
+        """
+        Devuelve los términos con mayor conteo, de mayor a menor, de forma \
+        similar al método `most_common` de `collections.Counter`.
+
+        :param n: Número de términos que se devuelven. Si `n = None`, se \
+            devuelven todos los términos del contador. Valor por defecto \
+            `None`.
+        :type n: int, opcional
+        :return: (list) Lista de tuplas (término, conteo).
+        """
+        if n is None:
+            return sorted(
+                self.conteos.items(), key=lambda x: x[1], reverse=True
+            )
+        return heapq.nlargest(n, self.conteos.items(), key=lambda x: x[1])
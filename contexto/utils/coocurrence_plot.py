@@ -1,9 +1,17 @@
 import numpy as np
 import networkx as nx
 import matplotlib.pyplot as plt
-from matplotlib import cm
+import pandas as pd
+from scipy import sparse
 import warnings
 
+# Opciones con las que se exportan los gráficos de coocurrencias
+OPCIONES_GUARDADO = {
+    "bbox_inches": "tight",
+    "transparent": False,
+    "facecolor": "w",
+    "dpi": 300,
+}
 
 # Definir lista de vértices (nodes)
 def normalize_size(size, vmin=10, vmax=40, scale=700):
@@ -24,58 +32,127 @@ def normalize_size(size, vmin=10, vmax=40, scale=700):
     return int((size / vmax) * scale + vmin)
 
 
-def graficar_coocurencia(
-    mat,
+def _aristas_matriz(mat):
+    """
+    Obtiene las conexiones (aristas) del grafo a partir de la parte \
+    triangular superior de una matriz de coocurrencias, sin incluir la \
+    diagonal. Si la matriz no es simétrica, se toma el mayor valor entre \
+    las posiciones (i, j) y (j, i).
+
+    :param mat: Matriz de coocurrencias. Puede tener columnas dispersas.
+    :type mat: pandas.DataFrame
+    :return: (tuple) Arreglos con la fila, la columna y el peso de cada \
+        conexión, ordenados por fila y columna.
+    """
+    if all(isinstance(t, pd.SparseDtype) for t in mat.dtypes):
+        valores = mat.sparse.to_coo().tocsr()
+        max_cooc = valores.max()
+        superior = sparse.triu(valores.maximum(valores.T), k=1).tocoo()
+        filas, columnas, pesos = superior.row, superior.col, superior.data
+        orden = np.lexsort((columnas, filas))
+        filas, columnas, pesos = filas[orden], columnas[orden], pesos[orden]
+    else:
+        valores = mat.to_numpy(dtype=float)
+        max_cooc = valores.max()
+        superior = np.triu(np.maximum(valores, valores.T), k=1)
+        filas, columnas = np.nonzero(superior)
+        pesos = superior[filas, columnas]
+    # El logaritmo del valor máximo se calcula una sola vez
+    pesos = pesos / np.log10(max_cooc)
+    validos = pesos > 0
+    return filas[validos], columnas[validos], pesos[validos]
+
+
+def construir_grafo(mat, n_nodos=0):
+    """
+    Construye el grafo no dirigido de términos de una matriz de \
+    coocurrencias. Cada par de términos que coocurren se conecta con un \
+    peso igual a su número de coocurrencias dividido por el logaritmo en \
+    base 10 del valor máximo de la matriz.
+
+    :param mat: Matriz de coocurrencias. Puede tener columnas dispersas.
+    :type mat: pandas.DataFrame
+    :param n_nodos: Número o porcentaje de nodos que se conservan (los de \
+        mayor número de conexiones). Ver la función \
+        `graficar_coocurencia`. Valor por defecto `0`.
+    :type n_nodos: float, int, opcional
+    :return: (networkx.Graph) Grafo de coocurrencias.
+    """
+    filas, columnas, pesos = _aristas_matriz(mat)
+    # Nodos en el orden en que aparecen en las conexiones, y su grado
+    extremos = np.column_stack([filas, columnas]).ravel()
+    nodos, primeros = np.unique(extremos, return_index=True)
+    nodos = nodos[np.argsort(primeros)]
+    grados = np.bincount(extremos, minlength=len(mat))[nodos]
+    # Eliminar nodos por criterio Numero o porcentaje, antes de construir
+    # el grafo. Se conservan los de mayor grado
+    n = len(nodos)
+    if n_nodos > 0 and n_nodos <= 1:
+        n = int(len(nodos) * n_nodos)
+    elif n_nodos > 1:
+        if n_nodos > len(nodos):
+            warnings.warn(
+                "n_nodos sobrepasa el número de nodos totales. "
+                "Se tomarán todos los nodos del grafo."
+            )
+        else:
+            n = n_nodos
+    if n < len(nodos):
+        conservar = np.argsort(grados, kind="stable")[::-1][:n]
+        conservar = np.sort(conservar)
+        incluidos = np.zeros(len(mat), dtype=bool)
+        incluidos[nodos[conservar]] = True
+        nodos = nodos[conservar]
+        validas = incluidos[filas] & incluidos[columnas]
+        filas, columnas = filas[validas], columnas[validas]
+        pesos = pesos[validas]
+    etiquetas = np.asarray(mat.index, dtype=object)
+    G = nx.Graph()
+    G.add_nodes_from(etiquetas[nodos].tolist())
+    G.add_weighted_edges_from(
+        zip(
+            etiquetas[filas].tolist(),
+            etiquetas[columnas].tolist(),
+            np.round(pesos, 1).tolist(),
+        )
+    )
+    return G
+
+
+def dibujar_coocurencia(
+    fig,
+    ax,
+    G,
     vmin=10,
     vmax=None,
     escala=700,
-    n_nodos=0,
     titulo="Gráfico de Coocurrencias",
-    dim_figura=(10, 6),
     node_cmap="RdPu",
     edge_cmap="Blues",
     offset_y=0.08,
     font_color="white",
     node_font_size=12,
     label_font_size=10,
-    visualizar=True,
-    ubicacion_archivo=None,
-    devolver_grafica=False,
     seed=12,
 ):
-    # Objeto del grafo
-    G = nx.Graph()
+    """
+    Dibuja un grafo de coocurrencias sobre unos ejes de `Matplotlib`, sin \
+    utilizar el estado global de `pyplot`. Esto permite dibujar en figuras \
+    creadas directamente con `matplotlib.figure.Figure`, por ejemplo desde \
+    varios procesos a la vez.
 
+    :param fig: Figura que contiene los ejes.
+    :type fig: matplotlib.figure.Figure
+    :param ax: Ejes sobre los que se dibuja el grafo.
+    :type ax: matplotlib.axes.Axes
+    :param G: Grafo de coocurrencias, obtenido con la función \
+        `construir_grafo`.
+    :type G: networkx.Graph
+    :return: (matplotlib.axes.Axes) Ejes con el grafo dibujado.
+    """
     # Mapas de colores
-    node_cmap = cm.get_cmap(node_cmap)
-    edge_cmap = cm.get_cmap(edge_cmap)
-
-    # máximo valor de la matriz
-    max_cooc = max(mat.max())
-
-    # calculando los bordes del grafo
-    for indice, fila in mat.iterrows():
-        for i, col in enumerate(fila):
-            peso = float(col) / np.log10(max_cooc)
-            if peso > 0 and (indice != mat.columns[i]):
-                G.add_edge(indice, mat.columns[i], weight=round(peso, 1))
-
-    # Eliminar nodos por criterio Numero o porcentaje
-    if n_nodos > 0 and n_nodos <= 1:
-        orden = sorted(list(G.degree), key=lambda kv: kv[1])[::-1]
-        n = int(len(orden) * n_nodos)
-        for no in orden[n:]:
-            G.remove_node(no[0])
-    elif n_nodos > 1:
-        if n_nodos > len(G):
-            warnings.warn(
-                "n_nodos sobrepasa el número de nodos totales. "
-                "Se tomarán todos los nodos del grafo."
-            )
-        else:
-            orden = sorted(list(G.degree), key=lambda kv: kv[1])[::-1]
-            for no in orden[n_nodos:]:
-                G.remove_node(no[0])
+    node_cmap = plt.get_cmap(node_cmap)
+    edge_cmap = plt.get_cmap(edge_cmap)
 
     # Máximo grado de conexiones
     if vmax is None:
@@ -96,9 +173,6 @@ def graficar_coocurencia(
     # posicion de los nodos
     pos = nx.spring_layout(G, seed=seed)
 
-    # objeto fig de matplotlib
-    fig, ax = plt.subplots(figsize=dim_figura)
-
     # gráficar nodos
     nodes = nx.draw_networkx_nodes(
         G,
@@ -106,26 +180,37 @@ def graficar_coocurencia(
         node_size=node_size,
         node_color=list(dict(G.degree).values()),
         cmap=node_cmap,
+        ax=ax,
     )
     # Colores para las conexiones
     edge_colors = [edge_cmap(c) for c in w_edges]
 
-    # graficar conexiones entre nodos
-    edges = []
-    for e in range(G.number_of_edges()):
-        edges.append(
-            nx.draw_networkx_edges(
-                G,
-                pos,
-                edgelist=[list(G.edges())[e]],
-                edge_color=edge_colors[e],
-                width=1.2,
-            )
+    # Graficar las conexiones en una sola colección, de menor a mayor peso,
+    # para que las conexiones más fuertes queden por encima
+    aristas = list(G.edges())
+    niveles = (np.asarray(w_edges) * len(aristas)).astype(int)
+    orden = np.argsort(niveles, kind="stable")
+    nx.draw_networkx_edges(
+        G,
+        pos,
+        edgelist=[aristas[i] for i in orden],
+        edge_color=[edge_colors[i] for i in orden],
+        width=1.2,
+        ax=ax,
+    )
+    # networkx agrega un margen del 5% alrededor de las conexiones que
+    # grafica. Los límites de los ejes se calculan con el margen de cada
+    # conexión por separado, para conservar el encuadre de la gráfica
+    extremos = np.array([(pos[u], pos[v]) for u, v in aristas])
+    minimos, maximos = extremos.min(axis=1), extremos.max(axis=1)
+    margen = 0.05 * (maximos - minimos)
+    ax.ignore_existing_data_limits = True
+    ax.update_datalim(
+        np.vstack(
+            [list(pos.values()), minimos - margen, maximos + margen]
         )
-
-    # Cambiar el plano en el grafico para traslape de conexiones
-    for e in range(G.number_of_edges()):
-        edges[e].set_zorder(int(w_edges[e] * G.number_of_edges()))
+    )
+    ax.autoscale_view()
 
     # Poner los nodos por encima de las conexiones
     nodes.set_zorder(G.number_of_edges() + 1)
@@ -133,7 +218,7 @@ def graficar_coocurencia(
     # Ubicando textos y grados de los nodos
     for key, value in pos.items():
         x, y = value[0] + 0, value[1] - offset_y
-        plt.text(
+        ax.text(
             x,
             y,
             s=key,
@@ -141,7 +226,7 @@ def graficar_coocurencia(
             fontsize=label_font_size,
             zorder=G.number_of_edges() + 1,
         )
-        plt.text(
+        ax.text(
             x,
             y - 0.015 + offset_y,
             s=G.degree[key],
@@ -152,26 +237,64 @@ def graficar_coocurencia(
         )
 
     # Ubicando colorbar del gráfico
-    plt.colorbar(
+    fig.colorbar(
         nodes,
+        ax=ax,
         label="Número de conexiones",
         orientation="vertical",
         shrink=0.4,
     )
 
     ax.set_title(titulo, {"fontsize": 15, "fontweight": 700})
-    plt.axis("off")
+    ax.axis("off")
+    return ax
+
+
+def graficar_coocurencia(
+    mat,
+    vmin=10,
+    vmax=None,
+    escala=700,
+    n_nodos=0,
+    titulo="Gráfico de Coocurrencias",
+    dim_figura=(10, 6),
+    node_cmap="RdPu",
+    edge_cmap="Blues",
+    offset_y=0.08,
+    font_color="white",
+    node_font_size=12,
+    label_font_size=10,
+    visualizar=True,
+    ubicacion_archivo=None,
+    devolver_grafica=False,
+    seed=12,
+):
+    # Construir el grafo a partir de la matriz
+    G = construir_grafo(mat, n_nodos)
+
+    # objeto fig de matplotlib
+    fig, ax = plt.subplots(figsize=dim_figura)
+    dibujar_coocurencia(
+        fig,
+        ax,
+        G,
+        vmin=vmin,
+        vmax=vmax,
+        escala=escala,
+        titulo=titulo,
+        node_cmap=node_cmap,
+        edge_cmap=edge_cmap,
+        offset_y=offset_y,
+        font_color=font_color,
+        node_font_size=node_font_size,
+        label_font_size=label_font_size,
+        seed=seed,
+    )
     if visualizar:
         plt.show()
 
     if ubicacion_archivo is not None:
-        plt.savefig(
-            ubicacion_archivo,
-            bbox_inches="tight",
-            transparent=False,
-            facecolor="w",
-            dpi=300,
-        )
+        fig.savefig(ubicacion_archivo, **OPCIONES_GUARDADO)
 
     if not visualizar and ubicacion_archivo is None:
         warnings.warn("Por favor fije una ruta para guardar la imagen")
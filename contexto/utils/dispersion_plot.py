@@ -5,6 +5,7 @@ import numpy as np
 import warnings
 import itertools
 import re
+from corpus import es_corpus
 
 
 class dispersionPlot:
@@ -58,7 +59,16 @@ class dispersionPlot:
 
     @textos.setter
     def textos(self, text):
-        if isinstance(text, str):
+        if es_corpus(text):
+            # Los tokens del corpus no se vuelven a separar; se guarda el
+            # término correspondiente a cada identificador del vocabulario
+            self._textos = text
+            terminos = text.vocabulario.terminos
+            if self._ignore_case:
+                terminos = [t.lower() for t in terminos]
+            self._terminos_corpus = terminos
+            self._all_words = set(terminos)
+        elif isinstance(text, str):
             self._textos = [
                 limpieza_basica(text, ignorar_mayus=self._ignore_case)
             ]
@@ -161,10 +171,13 @@ class dispersionPlot:
         Función para calcular finales de documentos y posición de \
         etiquetas en gráfico de dispersión.
         """
-        try:
-            limits = [len(t.split()) for t in self._textos]
-        except Exception:
-            limits = [len(t) for t in self._textos]
+        if es_corpus(self._textos):
+            limits = np.diff(self._textos.limites)
+        else:
+            try:
+                limits = [len(t.split()) for t in self._textos]
+            except Exception:
+                limits = [len(t) for t in self._textos]
         limits = np.cumsum(limits) - 1
         limits_ = np.insert(limits, 0, 0)
         x_pos = [
@@ -178,19 +191,24 @@ class dispersionPlot:
         """
         Comprueba si las keywords de entrada están en le texto.
         """
-        no_words = [w for w in keywords if w not in self._all_words]
+        palabras = self._all_words
+        if not isinstance(palabras, set):
+            palabras = set(palabras)
+        no_words = [w for w in keywords if w not in palabras]
         if no_words:
             if len(no_words) == len(keywords):
                 raise ValueError(
                     ("No existe palabras claves asociada a los documentos.")
                 )
-            no_words = ", ".join(no_words)
             warnings.warn(
                 (
-                    "Advertencia: las palabras: ({})".format(no_words)
+                    "Advertencia: las palabras: ({})".format(
+                        ", ".join(no_words)
+                    )
                     + " no están en los documentos de entrada"
                 )
             )
+            no_words = set(no_words)
             self._keywords = [w for w in keywords if w not in no_words]
         else:
             self._keywords = keywords
@@ -211,16 +229,25 @@ class dispersionPlot:
         """
         Calcula la dispersión de los términos en los documentos
         """
-        points = [
-            (x, y)
-            for x in range(len(self._all_words))
-            for y in range(len(self.keywords))
-            if self._all_words[x] == self.keywords[y]
-        ]
-
-        x, y = list(zip(*points))
+        # Posición de cada palabra clave en el eje y
+        posiciones = {k: i for i, k in enumerate(self.keywords)}
+        if es_corpus(self._textos):
+            # Se busca la posición de cada término del vocabulario una sola
+            # vez (-1 si no es palabra clave) y se asigna a cada token
+            y_terminos = np.array(
+                [posiciones.get(t, -1) for t in self._terminos_corpus],
+                dtype=np.int64,
+            )
+            y_palabras = y_terminos[self._textos.ids]
+        else:
+            y_palabras = np.fromiter(
+                (posiciones.get(w, -1) for w in self._all_words),
+                dtype=np.int64,
+                count=len(self._all_words),
+            )
+        x = np.nonzero(y_palabras >= 0)[0]
         self._points_x = x
-        self._points_y = y
+        self._points_y = y_palabras[x]
 
     def graficar(self):
         """
@@ -231,27 +258,19 @@ class dispersionPlot:
         fig, ax = plt.subplots(figsize=self._figsize)
         lines = list()
 
+        # Los puntos están ordenados por posición, por lo que los de cada
+        # documento forman un bloque continuo
+        cortes = np.searchsorted(x, self._limits, side="right")
         for i, d in enumerate(self._limits):
-            if i == 0:
-                lines += ax.plot(
-                    x[(x >= 0) & (x <= d)],
-                    y[(x >= 0) & (x <= d)],
-                    self._marker,
-                    ms=self._marker_size,
-                    mew=self._marker_width,
-                    color=self.colors[i],
-                )
-
-            else:
-                d_ant = self._limits[i - 1]
-                lines += ax.plot(
-                    x[(x > d_ant) & (x <= d)],
-                    y[(x > d_ant) & (x <= d)],
-                    self._marker,
-                    ms=self._marker_size,
-                    mew=self._marker_width,
-                    color=self._colors[i],
-                )
+            inicio = cortes[i - 1] if i > 0 else 0
+            lines += ax.plot(
+                x[inicio : cortes[i]],
+                y[inicio : cortes[i]],
+                self._marker,
+                ms=self._marker_size,
+                mew=self._marker_width,
+                color=self._colors[i],
+            )
 
             ax.axvline(x=d + 0.5, color="lightgray", linestyle="dashed")
 
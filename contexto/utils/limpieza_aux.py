@@ -1,7 +1,8 @@
 import re
 from collections import Counter
 from difflib import SequenceMatcher
-from tokenizacion import TokenizadorNLTK
+from functools import lru_cache
+from tokenizacion import tokenizador_defecto
 from ..limpieza import remover_acentos
 
 
@@ -32,6 +33,36 @@ def substrings_en_comun(str1, str2, longitud_min=10):
     return [str1[i.a : i.a + i.size] for i in coincidencias]
 
 
+def _fragmentos_comunes(palabras, comunes, tam_shingle):
+    """
+    Encuentra los fragmentos de un texto cubiertos por *shingles* \
+    (secuencias de `tam_shingle` palabras seguidas) comunes. Cada \
+    fragmento es una racha máxima de *shingles* comunes que se traslapan \
+    (que empiezan en palabras consecutivas); dos rachas que solo están una \
+    junto a la otra se mantienen separadas, para que el texto vecino no \
+    cambie el fragmento contado.
+
+    :param palabras: (list) Lista de palabras del texto.
+    :param comunes: (set) Conjunto con los *hashes* de los *shingles* \
+        comunes.
+    :param tam_shingle: (int) Número de palabras de cada *shingle*.
+    :return: (list) Lista de tuplas (primera palabra, última palabra) de \
+        cada fragmento, con los índices de las palabras en `palabras`.
+    """
+    fragmentos = []
+    anterior = None
+    for i in range(len(palabras) - tam_shingle + 1):
+        if hash(tuple(palabras[i : i + tam_shingle])) not in comunes:
+            continue
+        fin = i + tam_shingle - 1
+        if anterior is not None and i == anterior + 1:
+            fragmentos[-1] = (fragmentos[-1][0], fin)
+        else:
+            fragmentos.append((i, fin))
+        anterior = i
+    return fragmentos
+
+
 def detectar_coincidencias(lista_textos, prop=0.5, n_min=2, longitud_min=10):
     """
     Detecta y devuelve *substrings*, o cadenas de caracteres, que se \
@@ -44,6 +75,15 @@ def detectar_coincidencias(lista_textos, prop=0.5, n_min=2, longitud_min=10):
         * Que tengan un número de caracteres mayor o igual a una longitud \
         mínima establecida.
 
+    Para encontrar las coincidencias, cada texto se divide en *shingles* \
+    (secuencias de `n_min` palabras seguidas, o 2 si `n_min` es menor) y \
+    se cuenta en cuántos textos aparece cada uno. Las partes de cada texto \
+    cubiertas por rachas de *shingles* comunes que se traslapan forman los \
+    fragmentos candidatos, que se devuelven si a su vez aparecen en \
+    suficientes textos. El tiempo de ejecución crece de forma lineal con \
+    el tamaño de `lista_textos`, por lo que puede aplicarse a miles de \
+    páginas.
+
     :param lista_textos: (list) Lista de textos sobre los cuales se desea \
         buscar coincidencias.
     :param prop: (float) Valor por defecto: 0.5. Número entre 0 y 1 que \
@@ -59,29 +99,43 @@ def detectar_coincidencias(lista_textos, prop=0.5, n_min=2, longitud_min=10):
             considerada.
     :return: (list) Lista de coincidencias encontradas entre los textos \
         de entrada, que cumplan con las condiciones con los valores \
-        establecidos por el usuario. Si no hay ningúna cadena de \
-        caracteres que cumpla estas condiciones, se devuelve una lista vacía.
+        establecidos por el usuario, de la más larga a la más corta. Si no \
+        hay ningúna cadena de caracteres que cumpla estas condiciones, se \
+        devuelve una lista vacía.
     """
-    # Lista general de coincidencias entre los textos
-    # (que cumplan con longitud_min)
-    coincidencias = []
-    for i in range(len(lista_textos)):
-        for j in range(i + 1, len(lista_textos)):
-            con = substrings_en_comun(
-                lista_textos[i], lista_textos[j], longitud_min
+    tam_shingle = max(n_min, 2)
+    umbral = len(lista_textos) * prop
+    # Palabras de cada texto
+    textos_palabras = [t.split() for t in lista_textos]
+    # Número de textos en los que aparece cada shingle
+    frecuencia = Counter()
+    for palabras in textos_palabras:
+        frecuencia.update(
+            set(
+                hash(tuple(palabras[i : i + tam_shingle]))
+                for i in range(len(palabras) - tam_shingle + 1)
+            )
+        )
+    comunes = set(h for h, n in frecuencia.items() if n >= umbral)
+    del frecuencia
+    # Número de textos en los que aparece cada racha de shingles comunes
+    contador = Counter()
+    for palabras in textos_palabras:
+        fragmentos = _fragmentos_comunes(palabras, comunes, tam_shingle)
+        contador.update(
+            set(
+                " ".join(palabras[ini : fin + 1])
+                for ini, fin in fragmentos
             )
-            coincidencias += con
-    # Cantidad de veces que aparece cada coincidencia
-    contador = Counter(coincidencias)
+        )
     # Se filtran las coincidencias que aparezcan en una proporción
-    # de los textos menor a prop
-    comunes = {
-        x: contador[x]
-        for x in contador
-        if contador[x] >= len(lista_textos) * prop
-    }
-    # Se devuelven las coincidencias que tengan igual o más palabras que n_min
-    return [i for i in comunes if i is not None and len(i.split()) >= n_min]
+    # de los textos menor a prop, o que sean muy cortas
+    coincidencias = [
+        x
+        for x, n in contador.items()
+        if n >= umbral and len(x) >= longitud_min and len(x.split()) >= n_min
+    ]
+    return sorted(coincidencias, key=len, reverse=True)
 
 
 def quitar_coincidenias(lista_textos, prop=0.5, n_min=2, longitud_min=10):
@@ -97,7 +151,9 @@ def quitar_coincidenias(lista_textos, prop=0.5, n_min=2, longitud_min=10):
         mínima establecida.
 
         Cada coincidencia encontrada entre la lista de textos es reemplazada \
-        de los textos de entrada por un espacio en blanco.
+        de los textos de entrada por un espacio en blanco. Todas las \
+        coincidencias se quitan en una sola pasada por cada texto, sin \
+        importar el tipo o la cantidad de espacios entre sus palabras.
 
     :param lista_textos: (list) Lista de textos sobre los cuales se desea \
         buscar coincidencias.
@@ -118,16 +174,54 @@ def quitar_coincidenias(lista_textos, prop=0.5, n_min=2, longitud_min=10):
     coincidencias = detectar_coincidencias(
         lista_textos, prop, n_min, longitud_min
     )
-    for con in coincidencias:
-        lista_textos = [i.replace(con, " ") for i in lista_textos]
-    return lista_textos
+    if len(coincidencias) < 1:
+        return list(lista_textos)
+    # Una sola expresión regular con todas las coincidencias, de la más
+    # larga a la más corta, para que se prefieran las más largas. Solo se
+    # quitan coincidencias completas, que no hagan parte de otra palabra
+    patron = re.compile(
+        r"(?<!\S)(?:"
+        + "|".join(
+            r"\s+".join(re.escape(p) for p in con.split())
+            for con in coincidencias
+        )
+        + r")(?!\S)"
+    )
+    return [patron.sub(" ", i) for i in lista_textos]
 
 
 # Establece los criterios (de repetidos y consecutivos)
 # dependiendo de la longitud de la palabra de entrada.
 dict_condiciones = {1: 999, 2: 2, 3: 2, 4: 3}
 
-# Funciones basadas en expresiones regulares
+# Funciones basadas en expresiones regulares. Las expresiones se compilan
+# una sola vez por cada valor de n. Se usa typed=True porque n puede ser
+# True, que genera una expresión distinta a la de n=1
+
+
+@lru_cache(maxsize=None, typed=True)
+def _patron_repetidos(n):
+    return re.compile("([a-zA-Z0-9])" + "\\1" * (n - 1))
+
+
+@lru_cache(maxsize=None, typed=True)
+def _patron_consecutivos(n):
+    cond1 = "(?:(?:0(?=1)|1(?=2)|2(?=3)|3(?=4)|4(?=5)|5(?=6)|6(?=7)|7(?=8)"
+    cond2 = "|8(?=9))"
+    condf = f"{{{n-1},}}"
+    cond3 = "\\d|(?:a(?=b)|b(?=c)|c(?=d)|d(?=e)|e(?=f)|f(?=g)|g(?=h)|h(?=i)"
+    cond4 = "|i(?=j)|j(?=k)|k(?=l)|l(?=m)|m(?=n)|n(?=o)|o(?=p)|p(?=q)|q(?=r)"
+    cond5 = "r(?=s)|s(?=t)|t(?=u)|u(?=v)|v(?=w)|w(?=x)|x(?=y)|y(?=z))"
+    consecutivo = cond1 + cond2 + condf + cond3 + cond4 + cond5 + condf + ")"
+    return re.compile(consecutivo)
+
+
+@lru_cache(maxsize=None, typed=True)
+def _patron_consonantes(n, incluir_y=True):
+    # Decidir si se cuenta la "y" como vocal
+    if incluir_y:
+        return re.compile(f"(?:(?![aeiouy])[a-z]){{{n},}}")
+    return re.compile(f"(?:(?![aeiou])[a-z]){{{n},}}")
 
 
 def caracteres_repetidos(palabra, n, limpiar_palabra=True):
@@ -153,8 +247,7 @@ def caracteres_repetidos(palabra, n, limpiar_palabra=True):
     """
     if limpiar_palabra:
         palabra = remover_acentos(palabra).lower()
-    cond_repetido = "([a-zA-Z0-9])" + "\\1" * (n - 1)
-    return bool(re.search(cond_repetido, palabra))
+    return bool(_patron_repetidos(n).search(palabra))
 
 
 def caracteres_consecutivos(palabra, n, limpiar_palabra=True):
@@ -181,14 +274,7 @@ def caracteres_consecutivos(palabra, n, limpiar_palabra=True):
     """
     if limpiar_palabra:
         palabra = remover_acentos(palabra).lower()
-    cond1 = "(?:(?:0(?=1)|1(?=2)|2(?=3)|3(?=4)|4(?=5)|5(?=6)|6(?=7)|7(?=8)"
-    cond2 = "|8(?=9))"
-    condf = f"{{{n-1},}}"
-    cond3 = "\d|(?:a(?=b)|b(?=c)|c(?=d)|d(?=e)|e(?=f)|f(?=g)|g(?=h)|h(?=i)"
-    cond4 = "|i(?=j)|j(?=k)|k(?=l)|l(?=m)|m(?=n)|n(?=o)|o(?=p)|p(?=q)|q(?=r)"
-    cond5 = "r(?=s)|s(?=t)|t(?=u)|u(?=v)|v(?=w)|w(?=x)|x(?=y)|y(?=z))"
-    consecutivo = cond1 + cond2 + condf + cond3 + cond4 + cond5 + condf + ")"
-    return bool(re.search(consecutivo, palabra))
+    return bool(_patron_consecutivos(n).search(palabra))
 
 
 def consonantes_consecutivas(palabra, n, incluir_y=True, limpiar_palabra=True):
@@ -216,19 +302,46 @@ def consonantes_consecutivas(palabra, n, incluir_y=True, limpiar_palabra=True):
     """
     if limpiar_palabra:
         palabra = remover_acentos(palabra)
-    # Decidir si se cuenta la "y" como vocal
-    if incluir_y:
-        cond_consonantes = f"(?:(?![aeiouy])[a-z]){{{n},}}"
-    else:
-        cond_consonantes = f"(?:(?![aeiou])[a-z]){{{n},}}"
-    # Devolver condicion
-    return bool(re.search(cond_consonantes, palabra.lower()))
+    patron = _patron_consonantes(n, incluir_y)
+    return bool(patron.search(palabra.lower()))
 
 
 # Función para quitar de un texto las palabras que cumplan los criterios
 # de caracteres repetidos y/o consecutivos
 
 
+def _es_atipica(
+    palabra, n_repetidas, n_consecutivas, n_consonantes, incluir_y
+):
+    """
+    Determina si una palabra cumple alguno de los criterios de la función \
+    `quitar_palabras_atipicas`. La palabra ya debe estar limpia, si aplica.
+
+    :param palabra: (str) Palabra que se quiere analizar.
+    :return: (bool) True si la palabra cumple alguno de los criterios.
+    """
+    # Valor por reglas "duras", por si se necesita, según la longitud de
+    # la palabra
+    n = dict_condiciones.get(len(palabra), 4)
+    # Ajustar valores mínimos, si aplica
+    n_repetidas = n if n_repetidas == 0 else n_repetidas
+    n_consecutivas = n if n_consecutivas == 0 else n_consecutivas
+    n_consonantes = n if n_consonantes == 0 else n_consonantes
+    # La palabra es atípica si cumple alguna de las condiciones indicadas
+    # en los parámetros
+    if n_repetidas is not None:
+        if _patron_repetidos(n_repetidas).search(palabra):
+            return True
+    if n_consecutivas is not None:
+        if _patron_consecutivos(n_consecutivas).search(palabra):
+            return True
+    if n_consonantes is not None:
+        patron = _patron_consonantes(n_consonantes, incluir_y)
+        if patron.search(palabra.lower()):
+            return True
+    return False
+
+
 def quitar_palabras_atipicas(
     texto,
     n_repetidas=None,
@@ -251,8 +364,10 @@ def quitar_palabras_atipicas(
 
     Al final, devuelve el texto de entrada sin las palabras identificadas.
 
-    :param texto: (str) Texto al que se desean quitar palabras \
-        potencialmente problemáticas.
+    :param texto: (str o list) Texto al que se desean quitar palabras \
+        potencialmente problemáticas. También puede ser una lista de \
+        textos, en cuyo caso cada palabra distinta se revisa una sola vez \
+        para todos los textos.
     :param n_repetidas: (int) Valor por defecto: None. Número mínimo de \
         veces seguidas que se debe repetir un caracter en una palabra para \
         que cumpla este criterio. Si n_repetidas=None, la función no \
@@ -284,45 +399,33 @@ def quitar_palabras_atipicas(
     :param tokenizador: Valor por defecto: None. Objeto encargado de \
         la tokenización y detokenización de textos. Si el valor es 'None', \
         se cargará por defecto una instancia de la clase *TokenizadorNLTK*.
-    :return: (str) Devuelve el texto de entrada sin las palabras que hayan \
-        sido identificadas de acuerdo a los criterios especificados por \
-        el usuario.
+    :return: (str o list) Devuelve el texto de entrada sin las palabras \
+        que hayan sido identificadas de acuerdo a los criterios \
+        especificados por el usuario. Si se ingresó una lista de textos, \
+        se devuelve una lista con cada texto sin esas palabras.
     """
     if tokenizador is None:
-        tokenizador = TokenizadorNLTK()
-    # Guardar tokens del texto original para devolver las palabras
-    # originales al final
-    palabras_orig = tokenizador.tokenizar(texto)
-    # Si se eligió limpiar el texto, se quitan acentos y se
-    # pasa todo a minúsculas
-    if limpiar_palabras:
-        texto = remover_acentos(texto).lower()
-    # Se parte el texto en palabras y se inicializa la lista de salida
-    palabras = tokenizador.tokenizar(texto)
-    salida = []
-    for i, p in enumerate(palabras):
-        # Longitud de la palabra
-        l = len(p)
-        # Valor por reglas "duras", por si se necesita
-        n = dict_condiciones[l] if l in dict_condiciones else 4
-        # Ajustar valores mínimos, si aplica
-        n_repetidas = n if n_repetidas == 0 else n_repetidas
-        n_consecutivas = n if n_consecutivas == 0 else n_consecutivas
-        n_consonantes = n if n_consonantes == 0 else n_consonantes
-        # Se inicializan las dos condiciones, y si está indicado en los
-        # parámetros, se calculan
-        cond1 = cond2 = cond3 = False
-        if n_repetidas is not None:
-            cond1 = caracteres_repetidos(p, n_repetidas, False)
-        if n_consecutivas is not None:
-            cond2 = caracteres_consecutivos(p, n_consecutivas, False)
-        if n_consonantes is not None:
-            cond3 = consonantes_consecutivas(
-                p, n_consonantes, incluir_y, False
-            )
-        # La palabra solo se incluye en la salida si no cumple
-        # ninguna condición
-        if not any([cond1, cond2, cond3]):
-            salida.append(palabras_orig[i])
-    # Se pasa a texto la lista de salida, y se retorna
-    return tokenizador.destokenizar(salida)
+        tokenizador = tokenizador_defecto()
+    # Se tokeniza una sola vez. Si se ingresó un solo texto, se trabaja
+    # con una lista de un elemento
+    un_texto = isinstance(texto, str)
+    lista_tokens = tokenizador.tokenizar([texto] if un_texto else texto)
+    # Cada palabra distinta se revisa una sola vez
+    vocabulario = set(t for tokens in lista_tokens for t in tokens)
+    atipicas = set(
+        t
+        for t in vocabulario
+        if _es_atipica(
+            remover_acentos(t).lower() if limpiar_palabras else t,
+            n_repetidas,
+            n_consecutivas,
+            n_consonantes,
+            incluir_y,
+        )
+    )
+    # Se devuelven los textos sin las palabras atípicas
+    salida = [
+        tokenizador.destokenizar([t for t in tokens if t not in atipicas])
+        for tokens in lista_tokens
+    ]
+    return salida[0] if un_texto else salida
@@ -1,10 +1,12 @@
 import cv2
+import numpy as np
 import os
 import pytesseract
 import shutil
-from glob import glob
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
 from pdf2image.exceptions import PDFInfoNotInstalledError
-from pdf2image import convert_from_path
+from pdf2image import convert_from_path, pdfinfo_from_path
 from PIL import Image
 from lenguajes import lenguaje_tesseract
 from auxiliares import verificar_crear_dir
@@ -35,6 +37,15 @@ except TesseractNotFoundError:
     )
     exit(1)
 
+# Funciones de preprocesamiento, según su número
+PREPROCESAMIENTOS = {
+    1: procesar_img_1,
+    2: procesar_img_2,
+    3: procesar_img_3,
+    4: procesar_img_4,
+    5: procesar_img_5,
+}
+
 
 class OCR:
     def __init__(
@@ -43,8 +54,10 @@ class OCR:
         lenguaje,
         oem,
         psm,
-        dir_temporal="temp_pags/",
+        dir_temporal=None,
         enderezar=False,
+        n_hilos=None,
+        paginas_memoria=50,
     ):
         """
         Constructor por defecto de la clase OCR. Esta clase se encarga de \
@@ -99,12 +112,28 @@ class OCR:
             12: Buscador de texto disperso con OSD.
             13: Trata el texto como una única línea, sin utilizar métodos \
                 específicos de Tesseract.
-        :param dir_temporal: (string). Ruta donde se guardan páginas \
-            temporales de apoyo como imágenes durante el proceso de \
-            extracción de texto.
+        :param dir_temporal: (string). Valor por defecto: None. Carpeta \
+            dentro de la cual se crean las carpetas temporales de trabajo, \
+            donde se guardan las imágenes de apoyo durante el proceso de \
+            extracción de texto. Cada lectura usa su propia carpeta, con \
+            nombre único, que se borra al terminar. Si es None, se usa la \
+            carpeta temporal del sistema (que puede definirse con la \
+            variable de entorno TMPDIR). Puede apuntar, por ejemplo, a un \
+            disco local rápido o a un sistema de archivos en memoria.
         :param enderezar: (bool) {True, False}. Valor por defecto: False. \
             Permite enderezar texto torcido en la imagen para obtener \
             mejores resultados durante el proceso de extracción de texto.
+        :param n_hilos: (int). Valor por defecto: None. Número de páginas \
+            que se procesan al mismo tiempo al leer archivos PDF. Si es \
+            None, se utiliza el número de núcleos del equipo. Para evitar \
+            que cada proceso de Tesseract cree a su vez varios hilos, se \
+            recomienda definir la variable de entorno OMP_THREAD_LIMIT=1.
+        :param paginas_memoria: (int). Valor por defecto: 50. Número máximo \
+            de páginas de un archivo PDF que se procesan completamente en \
+            memoria. Si el documento tiene más páginas, las imágenes de las \
+            páginas se guardan temporalmente en disco, en una carpeta \
+            dentro de `dir_temporal`. Si es None, todos los documentos se \
+            procesan en memoria.
         """
         self.preprocesamiento = preprocesamiento
         self.dir_temporal = dir_temporal
@@ -112,50 +141,94 @@ class OCR:
         self.oem = oem
         self.psm = psm
         self.enderezar = enderezar
+        self.n_hilos = n_hilos if n_hilos is not None else os.cpu_count()
+        self.paginas_memoria = paginas_memoria
+
+    def carpeta_temporal(self):
+        """
+        Crea una carpeta temporal de trabajo con nombre único, dentro de \
+        `dir_temporal`. Al ser única, varios hilos o procesos pueden leer \
+        documentos al mismo tiempo sin sobreescribir los archivos de los \
+        demás.
+
+        :return: (string). Ruta de la carpeta creada.
+        """
+        if self.dir_temporal is not None:
+            verificar_crear_dir(self.dir_temporal)
+        return tempfile.mkdtemp(prefix="contexto_", dir=self.dir_temporal)
 
     def imagen_a_texto(self, ubicacion_imagen):
         """
         Se encarga de leer el texto de archivos de tipo imagen, con \
         extensión 'png', 'jpg' o 'jpeg', luego de aplicar el \
-        preprocesamiento definido al iniciar la clase OCR
+        preprocesamiento definido al iniciar la clase OCR. También acepta \
+        imágenes que ya están cargadas en memoria, en cuyo caso no se \
+        escribe ni se lee ningún archivo intermedio.
 
-        :param ubicacion_imagen: (string). Ruta de la imagen que se desea leer
+        :param ubicacion_imagen: (string, numpy array o imagen PIL). Ruta \
+            de la imagen que se desea leer, o la imagen ya cargada. Los \
+            arreglos de numpy deben estar en el formato de OpenCV (BGR).
         :return: (string). Texto del archivo tipo imagen leído con la clase OCR
         """
-        # Cargar la imagen de entrada
-        imagen = cv2.imread(ubicacion_imagen)
+        # Cargar la imagen de entrada, en el formato de OpenCV
+        if isinstance(ubicacion_imagen, str):
+            imagen = cv2.imread(ubicacion_imagen)
+        elif isinstance(ubicacion_imagen, Image.Image):
+            imagen = cv2.cvtColor(
+                np.asarray(ubicacion_imagen.convert("RGB")), cv2.COLOR_RGB2BGR
+            )
+        else:
+            imagen = ubicacion_imagen
         # Se define el preprocesamiento a aplicar
         # si el número está fuera de rango, no se aplica
         # ningún preprocesmiento
-        if 0 < self.preprocesamiento < 6:
-            imagen = eval(
-                f"procesar_img_{self.preprocesamiento}(imagen, {self.enderezar})"
-            )
-        # Se guarda la imagen en un archivo temporal
-        nombre_archivo = "{}.png".format(os.getpid())
-        cv2.imwrite(nombre_archivo, imagen)
+        if self.preprocesamiento in PREPROCESAMIENTOS:
+            funcion = PREPROCESAMIENTOS[self.preprocesamiento]
+            imagen = funcion(imagen, self.enderezar)
+        elif len(imagen.shape) == 3:
+            imagen = cv2.cvtColor(imagen, cv2.COLOR_BGR2RGB)
         # Se establecen las opciones para el OCR
         config = "-l {} --psm {} --oem {}".format(
             self.lenguaje, self.psm, self.oem
         )
-        # Se carga la imagen como un objeto PIL/Pillow image y se aplica el OCR
+        # Se aplica el OCR directamente sobre la imagen en memoria
         texto = pytesseract.image_to_string(
-            Image.open(nombre_archivo), config=config
+            Image.fromarray(imagen), config=config
         )
-        # Borrar el archivo de imagen preprocesada
-        os.remove(nombre_archivo)
         return str(texto)
 
-    def pdf_a_imagen(self, ubicacion_pdf):
-        """Se encarga de transformar archivos PDF a imagen
-        :param ubicacion_imagen: (string). Ruta del archivo PDF
+    def pdf_a_imagen(self, ubicacion_pdf, en_memoria=True, carpeta=None):
+        """
+        Se encarga de transformar archivos PDF a imagen.
+
+        :param ubicacion_pdf: (string). Ruta del archivo PDF.
+        :param en_memoria: (bool) {True, False}. Valor por defecto: True. \
+            Si es True, las páginas se mantienen en memoria como imágenes \
+            PIL. Si es False, las páginas se guardan como archivos PNG en \
+            disco, lo cual es útil para documentos muy grandes.
+        :param carpeta: (string). Valor por defecto: None. Carpeta donde se \
+            guardan las imágenes cuando `en_memoria=False`. Si es None, se \
+            crea una carpeta temporal con nombre único dentro de \
+            `dir_temporal`, que debe ser borrada por quien llama la función.
+        :return: (list). Lista de imágenes PIL de las páginas si \
+            `en_memoria=True`, o lista con las rutas de las imágenes de las \
+            páginas, en orden, si `en_memoria=False`.
         """
-        tempo_dir = self.dir_temporal + "/tempo/"
-        verificar_crear_dir(self.dir_temporal)
-        verificar_crear_dir(tempo_dir)
         try:
-            paginas = convert_from_path(
-                ubicacion_pdf, thread_count=8, output_folder=tempo_dir
+            if en_memoria:
+                return convert_from_path(
+                    ubicacion_pdf, thread_count=self.n_hilos
+                )
+            if carpeta is None:
+                carpeta = self.carpeta_temporal()
+            # Se usa el formato PNG, sin pérdida, para no afectar la
+            # calidad del OCR
+            return convert_from_path(
+                ubicacion_pdf,
+                thread_count=self.n_hilos,
+                output_folder=carpeta,
+                fmt="png",
+                paths_only=True,
             )
         except PDFInfoNotInstalledError:
             print(
@@ -172,35 +245,128 @@ class OCR:
                 )
             )
             exit(1)
-        # Counter to store images of each page of PDF to image
-        countador_img = 0
-        for pagina in paginas:
-            countador_img += 1
-            archivo = (
-                self.dir_temporal
-                + "/pagina_"
-                + str(countador_img).zfill(7)
-                + ".jpg"
-            )
-            pagina.save(archivo, "JPEG")
-        # Borrar folder temporal
-        shutil.rmtree(tempo_dir)
 
     def pdf_a_texto(self, ubicacion_pdf, borrar_folder=True):
         """
         Se encarga de leer el texto de archivos PDF ('.pdf'), luego de \
-        aplicar el preprocesamiento definido al iniciar la clase OCR.
+        aplicar el preprocesamiento definido al iniciar la clase OCR. Las \
+        páginas se procesan en paralelo, con el número de hilos definido en \
+        el parámetro `n_hilos` de la clase. Si el documento tiene más \
+        páginas que las definidas en el parámetro `paginas_memoria`, las \
+        imágenes de las páginas se guardan temporalmente en disco.
 
         :param ubicacion_imagen: (string). Ruta deL archivo PDF que se \
             desea leer.
-        :return: (string). Texto del archivo tipo PDF leído con la clase OCR.
+        :param borrar_folder: (bool) {True, False}. Valor por defecto: True. \
+            Indica si se borra la carpeta temporal con las imágenes de las \
+            páginas al terminar, en caso de que se haya utilizado.
+        :return: (list). Lista con el texto de cada página del archivo PDF, \
+            en el orden de las páginas.
         """
-        self.pdf_a_imagen(ubicacion_pdf)
-        imagenes = glob(self.dir_temporal + "/*.jpg")
-        paginas = []
-        for imagen in imagenes:
-            pagina = self.imagen_a_texto(imagen)
-            paginas.append(pagina)
-        if borrar_folder:
-            shutil.rmtree(self.dir_temporal)
+        en_memoria = self.paginas_memoria is None
+        if not en_memoria:
+            try:
+                n_paginas = pdfinfo_from_path(ubicacion_pdf)["Pages"]
+            except PDFInfoNotInstalledError:
+                # El error se reporta al intentar convertir el documento
+                n_paginas = 0
+            en_memoria = n_paginas <= self.paginas_memoria
+        carpeta = None if en_memoria else self.carpeta_temporal()
+        try:
+            imagenes = self.pdf_a_imagen(ubicacion_pdf, en_memoria, carpeta)
+            # Tesseract se ejecuta como un proceso externo, por lo que varios
+            # hilos pueden procesar páginas al mismo tiempo
+            with ThreadPoolExecutor(max_workers=self.n_hilos) as ejecutor:
+                paginas = list(ejecutor.map(self.imagen_a_texto, imagenes))
+        finally:
+            if borrar_folder and carpeta is not None:
+                shutil.rmtree(carpeta, ignore_errors=True)
         return paginas
+
+    def paginas_a_texto(self, ubicacion_pdf, paginas):
+        """
+        Se encarga de leer el texto de algunas páginas de un archivo PDF \
+        ('.pdf'), luego de aplicar el preprocesamiento definido al iniciar \
+        la clase OCR. Solo se convierten a imagen las páginas indicadas, y \
+        estas se procesan en paralelo con el número de hilos definido en el \
+        parámetro `n_hilos` de la clase.
+
+        :param ubicacion_pdf: (string). Ruta del archivo PDF que se desea \
+            leer.
+        :param paginas: (list). Lista con los números de las páginas (desde \
+            1) que se desean leer.
+        :return: (list). Lista con el texto de cada una de las páginas \
+            indicadas, en el mismo orden de `paginas`.
+        """
+
+        def leer_pagina(num_pagina):
+            imagen = convert_from_path(
+                ubicacion_pdf, first_page=num_pagina, last_page=num_pagina
+            )[0]
+            return self.imagen_a_texto(imagen)
+
+        try:
+            with ThreadPoolExecutor(max_workers=self.n_hilos) as ejecutor:
+                return list(ejecutor.map(leer_pagina, paginas))
+        except PDFInfoNotInstalledError:
+            print(
+                (
+                    "Poppler no está instalado, o su ubicación no está "
+                    "definida como una variable de entorno."
+                )
+            )
+            print(
+                (
+                    "Para mayor información, consulte la documentación de "
+                    "instalación: "
+                    "https://ucd-dnp.github.io/ConTexto/seccion_instalacion.html"
+                )
+            )
+            exit(1)
+
+    def iterar_pdf(self, ubicacion_pdf, tam_ventana=None):
+        """
+        Se encarga de leer el texto de archivos PDF ('.pdf') página por \
+        página, luego de aplicar el preprocesamiento definido al iniciar la \
+        clase OCR. Las páginas se convierten a imagen por ventanas de \
+        `tam_ventana` páginas, por lo que el uso de memoria no depende del \
+        tamaño del documento, y el texto de cada página se entrega apenas \
+        está disponible.
+
+        :param ubicacion_pdf: (string). Ruta del archivo PDF que se desea \
+            leer.
+        :param tam_ventana: (int). Valor por defecto: None. Número de \
+            páginas que se convierten a imagen y se procesan al mismo \
+            tiempo. Si es None, se utiliza el valor de `n_hilos`.
+        :return: (generator). Generador que entrega el texto de cada página \
+            del archivo PDF, en el orden de las páginas.
+        """
+        if tam_ventana is None:
+            tam_ventana = self.n_hilos
+        try:
+            n_paginas = pdfinfo_from_path(ubicacion_pdf)["Pages"]
+        except PDFInfoNotInstalledError:
+            print(
+                (
+                    "Poppler no está instalado, o su ubicación no está "
+                    "definida como una variable de entorno."
+                )
+            )
+            print(
+                (
+                    "Para mayor información, consulte la documentación de "
+                    "instalación: "
+                    "https://ucd-dnp.github.io/ConTexto/seccion_instalacion.html"
+                )
+            )
+            exit(1)
+        with ThreadPoolExecutor(max_workers=self.n_hilos) as ejecutor:
+            for inicio in range(1, n_paginas + 1, tam_ventana):
+                imagenes = convert_from_path(
+                    ubicacion_pdf,
+                    thread_count=self.n_hilos,
+                    first_page=inicio,
+                    last_page=min(inicio + tam_ventana - 1, n_paginas),
+                )
+                for texto in ejecutor.map(self.imagen_a_texto, imagenes):
+                    yield texto
@@ -1,5 +1,6 @@
 import os
 import stanza
+import tempfile
 import torch
 
 
@@ -148,20 +149,27 @@ def modificar_modelo(
     borrar_modelo = False
     if archivo_salida is None:
         borrar_modelo = True
-        archivo_salida = "{}.pt".format(os.getpid())
-    # Guardar modelo modificado
-    torch.save(modelo, archivo_salida)
-    # Cargar el modelo modificado
-    tipo = tipo.lower()
-    if tipo == "lemma":
-        nlp_pipe = stanza_pipeline("es", modelo_lemas=archivo_salida)
-    elif tipo == "pos":
-        nlp_pipe = stanza_pipeline("es", modelo_pos=archivo_salida)
-    elif tipo == "ner":
-        nlp_pipe = stanza_pipeline("es", modelo_ner=archivo_salida)
-    # Si no se especificó una ubicación para el modelo resultante, este se
-    # borra
-    if borrar_modelo:
-        os.remove(archivo_salida)
+        # Archivo temporal con nombre único, para que varios hilos o
+        # procesos puedan modificar modelos al mismo tiempo
+        descriptor, archivo_salida = tempfile.mkstemp(
+            suffix=".pt", prefix="contexto_"
+        )
+        os.close(descriptor)
+    try:
+        # Guardar modelo modificado
+        torch.save(modelo, archivo_salida)
+        # Cargar el modelo modificado
+        tipo = tipo.lower()
+        if tipo == "lemma":
+            nlp_pipe = stanza_pipeline("es", modelo_lemas=archivo_salida)
+        elif tipo == "pos":
+            nlp_pipe = stanza_pipeline("es", modelo_pos=archivo_salida)
+        elif tipo == "ner":
+            nlp_pipe = stanza_pipeline("es", modelo_ner=archivo_salida)
+    finally:
+        # Si no se especificó una ubicación para el modelo resultante, este
+        # se borra
+        if borrar_modelo:
+            os.remove(archivo_salida)
     # Devolver modelo modificado
     return nlp_pipe
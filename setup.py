@@ -26,6 +26,7 @@ INSTALL_REQUIRES = [
     "opencv-python>=4.5.2.54",
     "reportlab==3.5.68",
     "scikit-learn>=0.24.2",
+    "scipy>=1.5.4",
     "slate3k==0.5.3",
     "spacy>=3.0.6",
     "stanza>=1.2.1",